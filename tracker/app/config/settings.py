@@ -18,6 +18,13 @@ from datetime import timedelta
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
+def env_flag(name, default):
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.lower() in ("1", "true", "yes")
+
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.1/howto/deployment/checklist/
 
@@ -40,6 +47,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework_simplejwt",
     "django_filters",
@@ -48,6 +56,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "transactions.middleware.RequestInstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -65,7 +74,7 @@ CORS_ALLOWED_ORIGINS = [
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "transactions.authentication.StatelessJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
 }
@@ -100,14 +109,66 @@ LOGGING = {
             "level": "INFO",
             "propagate": False,
         },
+        "instrumentation": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
 
+# Opt-in per-request SQL count / DB time / render time instrumentation
+# (Server-Timing header, "instrumentation" log lines, /api/auth/metrics/requests/).
+REQUEST_INSTRUMENTATION = env_flag("REQUEST_INSTRUMENTATION", False)
+
+# Trace Python allocations during ETL runs to report per-stage peak memory.
+# Off by default: tracing slows the pipeline down several times.
+ETL_TRACE_MEMORY = env_flag("ETL_TRACE_MEMORY", False)
+
+# Rows per batch when streaming CSV/Excel imports (upload endpoint and ETL).
+TRANSACTION_IMPORT_CHUNK_SIZE = int(os.getenv("TRANSACTION_IMPORT_CHUNK_SIZE", 10000))
+# A RUNNING import job whose worker has not reported progress for this many
+# seconds is presumed dead and handed to the next worker. Must exceed the
+# time one chunk takes to import.
+IMPORT_JOB_STALE_AFTER = int(os.getenv("IMPORT_JOB_STALE_AFTER", 600))
+# How imported rows are written: "bulk_create" or "copy" (PostgreSQL COPY FROM STDIN).
+TRANSACTION_LOAD_STRATEGY = os.getenv("TRANSACTION_LOAD_STRATEGY", "bulk_create")
+# Largest batch accepted by the transactions bulk endpoint.
+TRANSACTION_BULK_MAX_ITEMS = int(os.getenv("TRANSACTION_BULK_MAX_ITEMS", 1000))
+# Rows fetched per database round trip (and per Parquet row group) when
+# streaming exports.
+TRANSACTION_EXPORT_CHUNK_SIZE = int(os.getenv("TRANSACTION_EXPORT_CHUNK_SIZE", 2000))
+
+# Per-user response cache for the dashboard and analytics endpoints. Local
+# memory by default; point CACHE_BACKEND/CACHE_LOCATION at e.g. Redis or
+# Memcached to share it between workers.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "finance-tracker"),
+    }
+}
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300))
+# Seconds before the in-process category name -> id map is reloaded, bounding
+# how long category changes made by other processes can go unseen.
+CATEGORY_CACHE_TTL = int(os.getenv("CATEGORY_CACHE_TTL", 300))
+
+# Percentages of Budget.limit_amount reported by /api/auth/budgets/alerts/.
+BUDGET_ALERT_THRESHOLDS = [80, 100]
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=60),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_OBTAIN_SERIALIZER": "transactions.authentication.RoleTokenObtainPairSerializer",
 }
+# Seconds a user's is_active/role is trusted before the stateless JWT
+# authentication looks it up again, bounding how long a deactivated or
+# re-roled user's tokens keep working in other processes.
+JWT_USER_STATE_TTL = int(os.getenv("JWT_USER_STATE_TTL", 30))
 
 ROOT_URLCONF = "config.urls"
 
@@ -141,9 +202,24 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "password"),
         "HOST": os.getenv("DB_HOST", "127.0.0.1"),
         "PORT": os.getenv("DB_PORT", 5432),
+        # Seconds a connection is reused across requests (0 closes it after
+        # every request); health checks replace connections the server dropped.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": env_flag("DB_CONN_HEALTH_CHECKS", True),
+        "OPTIONS": {},
     }
 }
 
+# psycopg 3 connection pool, one per process. Django manages pooled
+# connections itself, so persistent connections are switched off with it.
+if env_flag("DB_POOL", False):
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 2)),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", 10)),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -181,6 +257,10 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Uploaded import files wait here until the import worker picks them up, so
+# the web and worker containers must share this directory.
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
 
@@ -0,0 +1,266 @@
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date
+
+import django
+import pandas as pd
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.dirname(SCRIPTS_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from rest_framework_simplejwt.tokens import RefreshToken  # noqa: E402
+from scripts.benchmark_transform import build_frame  # noqa: E402
+from scripts.fake_transactions import EXPENSE_CATEGORIES  # noqa: E402
+from scripts.fake_users import generate_fake_users  # noqa: E402
+from transactions.etl.load import load_transactions  # noqa: E402
+from transactions.etl.pipeline import import_transactions  # noqa: E402
+from transactions.etl.transform import transform_transaction  # noqa: E402
+from transactions.jobs import process_next_job  # noqa: E402
+from transactions.models import Budget, Category  # noqa: E402
+
+# Median latency may grow by this fraction before --compare flags it.
+DEFAULT_THRESHOLD = 0.2
+
+
+def generate_frame(rows):
+    # Tiled Faker rows repeat, so spread them a second apart to keep every
+    # row distinct for the import deduplication.
+    frame = transform_transaction(build_frame(rows, sample_size=min(rows, 2000)))
+    frame["date"] += pd.to_timedelta(range(len(frame)), unit="s")
+    return frame
+
+
+def csv_upload(rows):
+    csv_file = io.StringIO()
+    build_frame(rows, sample_size=min(rows, 2000)).to_csv(csv_file, index=False)
+    csv_file.seek(0)
+    csv_file.name = "transactions.csv"
+    return csv_file
+
+
+def seed(users, transactions_per_user):
+    # N users x M transactions, plus a budget per expense category for the
+    # current month so the budget list has something to aggregate.
+    strategy = "copy" if connection.vendor == "postgresql" else "bulk_create"
+    today = date.today()
+    start, end = today.replace(day=1), today.replace(day=28)
+    seeded = generate_fake_users(num_users=users, password=None)
+    categories = [
+        Category.objects.get_or_create(name=name)[0] for name in EXPENSE_CATEGORIES
+    ]
+    for user in seeded:
+        Budget.objects.bulk_create(
+            Budget(
+                user=user,
+                category=category,
+                limit_amount=1000,
+                period="MONTHLY",
+                start_date=start,
+                end_date=end,
+            )
+            for category in categories
+        )
+        # Loaded after the budgets so their spent counters include the rows.
+        load_transactions(generate_frame(transactions_per_user), user, strategy=strategy)
+    return seeded
+
+
+def rolled_back(call):
+    # Write scenarios are undone after each run so every repeat sees the
+    # same table.
+    def run():
+        with transaction.atomic():
+            call()
+            transaction.set_rollback(True)
+
+    return run
+
+
+def measure(call, repeat, rows=None, before=None):
+    timings, queries = [], []
+    for _ in range(repeat):
+        if before:
+            before()
+        with CaptureQueriesContext(connection) as ctx:
+            started = time.perf_counter()
+            call()
+            timings.append(time.perf_counter() - started)
+        queries.append(len(ctx.captured_queries))
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "latency_ms": {
+            "median": round(statistics.median(timings) * 1000, 3),
+            "p95": round(timings[int(0.95 * (len(timings) - 1))] * 1000, 3),
+            "min": round(timings[0] * 1000, 3),
+        },
+        "queries": max(queries),
+        "throughput": round((rows or 1) * repeat / total, 1) if total else None,
+        "throughput_unit": "rows/s" if rows else "req/s",
+    }
+
+
+def run_suite(users, transactions_per_user, repeat, upload_rows):
+    user = seed(users, transactions_per_user)[0]
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}"
+    )
+
+    def get(name):
+        def call():
+            response = client.get(reverse(name))
+            assert response.status_code == 200, (name, response.status_code)
+
+        return call
+
+    def upload():
+        response = client.post(
+            reverse("transaction-upload-file"),
+            {"file": csv_upload(upload_rows)},
+            format="multipart",
+        )
+        assert response.status_code == 202, response.status_code
+        assert process_next_job().status == "COMPLETED"
+
+    etl_source = csv_upload(upload_rows).getvalue()
+
+    def etl():
+        import_transactions(io.StringIO(etl_source), user, filename="transactions.csv")
+
+    def clear_response_cache():
+        caches[settings.RESPONSE_CACHE_ALIAS].clear()
+
+    return {
+        # Response cache cleared first, so this is the cold dashboard build.
+        "dashboard": measure(
+            get("transaction-dashboard"), repeat, before=clear_response_cache
+        ),
+        "budget_list": measure(get("budget-list"), repeat),
+        "transaction_list": measure(get("transaction-list"), repeat),
+        "upload": measure(rolled_back(upload), repeat, rows=upload_rows),
+        "etl": measure(rolled_back(etl), repeat, rows=upload_rows),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPTS_DIR, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = current["latency_ms"]["median"] / max(
+            previous["latency_ms"]["median"], 1e-9
+        )
+        print(
+            f"{name:<18} median {previous['latency_ms']['median']:>9.1f} -> "
+            f"{current['latency_ms']['median']:>9.1f} ms ({ratio - 1:+7.1%}) | "
+            f"queries {previous['queries']:>3} -> {current['queries']:>3}"
+        )
+        if ratio > 1 + threshold:
+            regressions.append(f"{name}: median latency {ratio - 1:+.1%}")
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name}: queries {previous['queries']} -> {current['queries']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the API hot paths")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--transactions", type=int, default=1000, help="per user")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--upload-rows", type=int, default=1000)
+    parser.add_argument("--output", help="default: scripts/baselines/<commit>.json")
+    parser.add_argument("--compare", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    # Runs against a throwaway test database, never the configured one.
+    setup_test_environment()
+    old_config = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    media_root = tempfile.mkdtemp()
+    try:
+        with override_settings(MEDIA_ROOT=media_root):
+            results = run_suite(
+                args.users, args.transactions, args.repeat, args.upload_rows
+            )
+    finally:
+        connection.creation.destroy_test_db(old_config, verbosity=0)
+        teardown_test_environment()
+        shutil.rmtree(media_root, ignore_errors=True)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "params": {
+            "users": args.users,
+            "transactions_per_user": args.transactions,
+            "repeat": args.repeat,
+            "upload_rows": args.upload_rows,
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(SCRIPTS_DIR, "baselines", f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    for name, result in results.items():
+        print(
+            f"{name:<18} median {result['latency_ms']['median']:>9.1f} ms | "
+            f"p95 {result['latency_ms']['p95']:>9.1f} ms | "
+            f"queries {result['queries']:>3} | "
+            f"{result['throughput']} {result['throughput_unit']}"
+        )
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["params"] != report["params"]:
+            print("Warning: baseline was recorded with different parameters")
+        regressions = compare(results, baseline["results"], args.threshold)
+        if regressions:
+            print("Regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
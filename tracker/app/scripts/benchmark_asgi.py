@@ -0,0 +1,88 @@
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Concurrency benchmark of the read endpoints: the DRF views served by
+# gunicorn (WSGI) against their async counterparts served by uvicorn (ASGI).
+# Both servers must be running against the same database, e.g.
+#   docker compose --profile asgi up web web_asgi
+
+ENDPOINTS = {
+    "dashboard": ("transactions/dashboard/", "async/dashboard/"),
+    "monthly_expense": ("transactions/monthly-expense/", "async/monthly-expense/"),
+    "budget_list": ("budgets/", "async/budgets/"),
+}
+API_PREFIX = "/api/auth/"
+
+
+def login(base_url, username, password):
+    request = urllib.request.Request(
+        f"{base_url}{API_PREFIX}login/",
+        data=json.dumps({"username": username, "password": password}).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)["access"]
+
+
+def timed_get(url, token):
+    request = urllib.request.Request(url, headers={"Authorization": f"Bearer {token}"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def run(url, token, concurrency, requests):
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        timings = sorted(pool.map(lambda _: timed_get(url, token), range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(timings) * 1000, 2),
+        "p95_ms": round(timings[int(0.95 * (len(timings) - 1))] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare WSGI and ASGI read endpoints")
+    parser.add_argument("--wsgi-url", default="http://localhost:8000")
+    parser.add_argument("--asgi-url", default="http://localhost:8001")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=sorted(ENDPOINTS))
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    token = login(args.wsgi_url, args.username, args.password)
+    results = []
+    for name in args.endpoints:
+        sync_path, async_path = ENDPOINTS[name]
+        for concurrency in args.concurrency:
+            for mode, url in [
+                ("wsgi", f"{args.wsgi_url}{API_PREFIX}{sync_path}"),
+                ("asgi", f"{args.asgi_url}{API_PREFIX}{async_path}"),
+            ]:
+                result = run(url, token, concurrency, args.requests)
+                results.append(
+                    {"endpoint": name, "mode": mode, "concurrency": concurrency, **result}
+                )
+                print(
+                    f"{name:<16} {mode} c={concurrency:<3} "
+                    f"{result['requests_per_second']:>8.1f} req/s | "
+                    f"p50 {result['p50_ms']:>8.2f} ms | p95 {result['p95_ms']:>8.2f} ms"
+                )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+from benchmark_asgi import API_PREFIX, login, run
+
+# Latency under concurrent load of one gunicorn deployment started three
+# times with different database connection handling: a new connection per
+# request, persistent connections (CONN_MAX_AGE) and the psycopg pool.
+# Runs against the database configured in the environment; the user given
+# with --username must exist there.
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = {
+    "per_request": {"DB_CONN_MAX_AGE": "0", "DB_POOL": "false"},
+    "persistent": {"DB_CONN_MAX_AGE": "60", "DB_POOL": "false"},
+    "pool": {"DB_POOL": "true"},
+}
+ENDPOINTS = ["transactions/", "budgets/", "transactions/dashboard/"]
+
+
+def start_server(mode, port, workers, threads):
+    env = {**os.environ, **MODES[mode]}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "gunicorn", "config.wsgi:application",
+            "--bind", f"127.0.0.1:{port}",
+            "--workers", str(workers),
+            "--threads", str(threads),
+            "--worker-class", "gthread",
+        ],
+        cwd=APP_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(f"{base_url}{API_PREFIX}login/")
+        except urllib.error.HTTPError:
+            return server, base_url
+        except urllib.error.URLError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"gunicorn did not start for mode {mode}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare database connection handling under load")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--port", type=int, default=8010)
+    parser.add_argument("--output", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for mode in args.modes:
+        server, base_url = start_server(mode, args.port, args.workers, args.threads)
+        try:
+            token = login(base_url, args.username, args.password)
+            for endpoint in ENDPOINTS:
+                for concurrency in args.concurrency:
+                    result = run(f"{base_url}{API_PREFIX}{endpoint}", token, concurrency, args.requests)
+                    results.append(
+                        {"mode": mode, "endpoint": endpoint, "concurrency": concurrency, **result}
+                    )
+                    print(
+                        f"{mode:<12} {endpoint:<24} c={concurrency:<3} "
+                        f"{result['requests_per_second']:>8.1f} req/s | "
+                        f"p50 {result['p50_ms']:>8.2f} ms | p95 {result['p95_ms']:>8.2f} ms"
+                    )
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import argparse
+import os
+import sys
+import time
+
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    setup_test_environment,
+    teardown_test_environment,
+)
+from scripts.benchmark_api import generate_frame  # noqa: E402
+from transactions.etl.load import load_transactions  # noqa: E402
+
+User = get_user_model()
+
+
+def timed_load(df, user, strategy, batch_size):
+    # Every run is rolled back so each strategy starts from the same table.
+    with transaction.atomic():
+        started = time.perf_counter()
+        result = load_transactions(df, user, strategy=strategy, batch_size=batch_size)
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    return result["inserted"], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transaction load strategies")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[500, 1000, 5000, 10000]
+    )
+    args = parser.parse_args()
+
+    # Distinct rows, so deduplication does not skip any of them.
+    df = generate_frame(args.rows)
+
+    # Runs against a throwaway test database, never the configured one.
+    setup_test_environment()
+    old_config = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        user = User.objects.create_user(username="benchmark_loader")
+        runs = [("bulk_create", size) for size in args.batch_sizes] + [("copy", None)]
+        for strategy, batch_size in runs:
+            inserted, elapsed = timed_load(df, user, strategy, batch_size)
+            label = f"{strategy} (batch={batch_size})" if batch_size else strategy
+            print(
+                f"{label:<28} {inserted / elapsed:>10.0f} rows/s "
+                f"({inserted} rows, {elapsed:.2f}s)"
+            )
+    finally:
+        connection.creation.destroy_test_db(old_config, verbosity=0)
+        teardown_test_environment()
+
+
+if __name__ == "__main__":
+    main()
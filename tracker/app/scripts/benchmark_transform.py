@@ -0,0 +1,77 @@
+import argparse
+import os
+import sys
+import timeit
+
+import django
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from scripts.fake_transactions import generate_transactions  # noqa: E402
+from transactions.etl.transform import transform_transaction  # noqa: E402
+
+
+def rowwise_transform(df):
+    # The original row-by-row implementation, kept as the baseline.
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df = df.dropna(subset=["date"])
+    df["date"] = df["date"].apply(
+        lambda d: timezone.make_aware(d) if timezone.is_naive(d) else d
+    )
+    df["description"] = df["description"].replace({"None": None})
+    df["category"] = df["category"].apply(
+        lambda x: (
+            str(x).strip().title()
+            if pd.notna(x) and str(x).strip() != ""
+            else "Miscellaneous"
+        )
+    )
+    df["transaction_type"] = df.apply(
+        lambda row: "EXPENSE" if row["amount"] < 0 else "INCOME", axis=1
+    )
+    df["amount"] = df["amount"].abs()
+    return df
+
+
+def build_frame(rows, sample_size=10000):
+    # Faker is slow, so tile a generated sample up to the requested size.
+    sample = pd.DataFrame(
+        [generate_transactions() for _ in range(min(rows, sample_size))]
+    )
+    repeats = -(-rows // len(sample))
+    return pd.concat([sample] * repeats, ignore_index=True).iloc[:rows]
+
+
+def best_of(func, df, repeat):
+    return min(timeit.repeat(lambda: func(df.copy()), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark transform_transaction")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        df = build_frame(rows)
+
+        pd.testing.assert_frame_equal(
+            transform_transaction(df.copy()),
+            rowwise_transform(df.copy()),
+            check_dtype=False,
+        )
+
+        rowwise = best_of(rowwise_transform, df, args.repeat)
+        vectorized = best_of(transform_transaction, df, args.repeat)
+        print(
+            f"{rows:>9} rows | row-wise {rowwise:8.3f}s | vectorized {vectorized:8.3f}s "
+            f"| speedup {rowwise / vectorized:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,28 +7,29 @@ fake = Faker()
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-if __name__ == "__main__":
-
-    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
-    django.setup()
 
+def generate_fake_users(num_users=5, password="password123"):
     from django.contrib.auth import get_user_model
 
     User = get_user_model()
 
-    def generate_fake_users(num_users=5):
-        users = []
-        for _ in range(num_users):
-            username = fake.user_name()
-            email = fake.email()
-            password = "password123"
-            role = "user"
-
-            user = User.objects.create_user(
-                username=username, email=email, password=password, role=role
-            )
-            users.append(user)
-        return users
+    users = []
+    for _ in range(num_users):
+        username = fake.unique.user_name()
+        email = fake.email()
+        role = "user"
+
+        user = User.objects.create_user(
+            username=username, email=email, password=password, role=role
+        )
+        users.append(user)
+    return users
+
+
+if __name__ == "__main__":
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
 
     users = generate_fake_users(num_users=8)
     for user in users:
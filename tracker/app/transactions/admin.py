@@ -1,5 +1,13 @@
 from django.contrib import admin
-from .models import User, Category, Transaction, Budget
+from .models import (
+    User,
+    Category,
+    Transaction,
+    Budget,
+    MonthlyRollup,
+    ImportJob,
+    EtlRun,
+)
 
 
 @admin.register(User)
@@ -10,3 +18,21 @@ class UserAdmin(admin.ModelAdmin):
 admin.site.register(Category)
 admin.site.register(Transaction)
 admin.site.register(Budget)
+admin.site.register(MonthlyRollup)
+admin.site.register(ImportJob)
+
+
+@admin.register(EtlRun)
+class EtlRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "started_at",
+        "user",
+        "source",
+        "status",
+        "rows",
+        "imported",
+        "dropped",
+        "duration_seconds",
+        "peak_memory_mb",
+    )
+    list_filter = ("status", "strategy")
@@ -0,0 +1,96 @@
+from functools import wraps
+
+from django.http import JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .authentication import StatelessJWTAuthentication
+from .cache import acached_for_user
+from .dashboard import abuild_dashboard, monthly_expenses, shape_monthly_expenses
+from .models import Budget
+from .serializers import BudgetReadSerializer
+
+# Async-native counterparts of the dashboard, monthly-expense and budget list
+# endpoints. DRF views are sync-only, so these are plain Django async views
+# that authenticate the JWT themselves and read through the async ORM. Under
+# ASGI (uvicorn) they never occupy a worker thread while waiting on queries.
+
+BUDGET_ORDERING_FIELDS = ("start_date", "limit_amount")
+jwt_authentication = StatelessJWTAuthentication()
+
+
+async def authenticate(request):
+    header = jwt_authentication.get_header(request)
+    raw_token = header and jwt_authentication.get_raw_token(header)
+    if not raw_token:
+        return None
+    try:
+        token = jwt_authentication.get_validated_token(raw_token)
+        return await jwt_authentication.aget_user(token)
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def json_response(data, status=200):
+    # DRF's encoder, so payloads match the sync endpoints byte for byte.
+    return JsonResponse(data, status=status, safe=False, encoder=JSONEncoder)
+
+
+def async_api_view(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != "GET":
+            return json_response(
+                {"detail": f'Method "{request.method}" not allowed.'}, status=405
+            )
+        user = await authenticate(request)
+        if user is None:
+            return json_response(
+                {"detail": "Authentication credentials were not provided."}, status=401
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+
+    return wrapper
+
+
+@async_api_view
+async def dashboard(request):
+    return json_response(
+        await acached_for_user(
+            "dashboard", request, lambda: abuild_dashboard(request.user)
+        )
+    )
+
+
+@async_api_view
+async def monthly_expense(request):
+    async def compute():
+        return shape_monthly_expenses(
+            [row async for row in monthly_expenses(request.user)]
+        )
+
+    return json_response(await acached_for_user("monthly_expense", request, compute))
+
+
+@async_api_view
+async def budget_list(request):
+    budgets = Budget.objects.select_related("category", "user")
+    if request.user.role != "admin":
+        budgets = budgets.filter(user=request.user)
+    for field in ["category", "period", "is_active"]:
+        value = request.GET.get(field)
+        if value is None:
+            continue
+        if field == "category" and not value.isdigit():
+            return json_response({"category": ["Enter a number."]}, status=400)
+        if field == "is_active":
+            value = value.lower() in ("true", "1")
+        budgets = budgets.filter(**{field: value})
+
+    ordering = request.GET.get("ordering", "-start_date")
+    if ordering.lstrip("-") not in BUDGET_ORDERING_FIELDS:
+        ordering = "-start_date"
+
+    rows = [budget async for budget in budgets.order_by(ordering)]
+    return json_response(BudgetReadSerializer(rows, many=True).data)
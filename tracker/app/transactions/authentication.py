@@ -0,0 +1,108 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+User = get_user_model()
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["role"] = user.role
+        return token
+
+
+class UserStateCache:
+    # Process-wide user id -> (is_active, role) map used to revoke tokens of
+    # deactivated, deleted or re-roled users. Entries live for
+    # JWT_USER_STATE_TTL seconds, which bounds how long a change made by
+    # another process goes unnoticed; changes made here evict immediately.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states = {}
+
+    def clear(self):
+        with self._lock:
+            self._states = {}
+
+    def forget(self, user_id):
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def _cached(self, user_id):
+        with self._lock:
+            entry = self._states.get(user_id)
+        if entry and time.monotonic() - entry[0] <= settings.JWT_USER_STATE_TTL:
+            return entry[1]
+        return None
+
+    def _store(self, user_id, state):
+        with self._lock:
+            self._states[user_id] = (time.monotonic(), state)
+        return state
+
+    def _query(self, user_id):
+        return User.objects.filter(pk=user_id).values_list("is_active", "role")
+
+    def get(self, user_id):
+        state = self._cached(user_id)
+        if state is None:
+            state = self._store(user_id, self._query(user_id).first() or (False, None))
+        return state
+
+    async def aget(self, user_id):
+        state = self._cached(user_id)
+        if state is None:
+            state = self._store(user_id, await self._query(user_id).afirst() or (False, None))
+        return state
+
+
+user_state_cache = UserStateCache()
+
+
+def forget_user_state(user_id):
+    user_state_cache.forget(user_id)
+    # Another request may cache the old row before this transaction commits.
+    transaction.on_commit(lambda: user_state_cache.forget(user_id))
+
+
+def token_user(token, user_id, state):
+    is_active, role = state
+    claimed_role = token.get("role", role)
+    if not is_active or claimed_role != role:
+        raise AuthenticationFailed("Token is no longer valid.", code="token_revoked")
+    # An unsaved-looking but persisted instance: foreign keys, filters and
+    # equality work as with a loaded row, without loading it.
+    user = User(pk=user_id, role=role, is_active=True)
+    user._state.adding = False
+    user._state.db = "default"
+    return user
+
+
+def user_id_of(token):
+    try:
+        return int(token[jwt_settings.USER_ID_CLAIM])
+    except (KeyError, TypeError, ValueError):
+        raise InvalidToken("Token contained no recognizable user identification")
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    # Builds request.user from the token's user_id and role claims instead of
+    # loading the User row on every request.
+
+    def get_user(self, validated_token):
+        user_id = user_id_of(validated_token)
+        return token_user(validated_token, user_id, user_state_cache.get(user_id))
+
+    async def aget_user(self, validated_token):
+        user_id = user_id_of(validated_token)
+        return token_user(validated_token, user_id, await user_state_cache.aget(user_id))
@@ -0,0 +1,195 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Budget, Transaction
+
+# Spent / remaining / percentage for any number of budgets of any period.
+# Expenses are summed per user, category and day in one query; every budget
+# window (start_date..end_date, both inclusive) is then resolved against
+# running totals by binary search, instead of a query or loop per budget.
+#
+# Budget.spent_amount keeps the result as a running counter: every write
+# path feeds its expense rows through record_spent/record_spent_frame, which
+# resolves them against the affected budgets the same way.
+
+DAY_SPAN = date.max.toordinal() + 1
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def day_numbers(days):
+    return np.array(days, dtype="datetime64[D]").astype(np.int64) + EPOCH_ORDINAL
+
+
+def expense_days(budgets):
+    tz = timezone.get_current_timezone()
+    first = datetime.combine(min(b.start_date for b in budgets), time.min, tzinfo=tz)
+    last = datetime.combine(max(b.end_date for b in budgets) + timedelta(days=1), time.min, tzinfo=tz)
+    return (
+        Transaction.objects.filter(
+            transaction_type="EXPENSE",
+            user_id__in={b.user_id for b in budgets},
+            category_id__in={b.category_id for b in budgets},
+            date__gte=first,
+            date__lt=last,
+        )
+        .annotate(day=TruncDate("date"))
+        .values("user_id", "category_id", "day")
+        .annotate(total=Sum("amount"))
+        .values_list("user_id", "category_id", "day", "total")
+        .order_by()
+    )
+
+
+def spent_amounts(budgets, rows):
+    if not budgets:
+        return []
+    groups = pd.factorize(
+        pd.MultiIndex.from_arrays(
+            [
+                [b.user_id for b in budgets] + [r[0] for r in rows],
+                [b.category_id for b in budgets] + [r[1] for r in rows],
+            ]
+        )
+    )[0].astype(np.int64)
+    budget_groups, row_groups = groups[: len(budgets)], groups[len(budgets):]
+
+    # (user, category, day) keys in order, with the running total of cents
+    # up to each key: a window's spend is the difference at its two ends.
+    keys = row_groups * DAY_SPAN + day_numbers([r[2] for r in rows])
+    cents = (np.array([r[3] for r in rows], dtype=object) * 100).astype(np.int64)
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    running = np.concatenate([[0], np.cumsum(cents[order])])
+
+    budget_keys = budget_groups * DAY_SPAN
+    lo = np.searchsorted(keys, budget_keys + day_numbers([b.start_date for b in budgets]), "left")
+    hi = np.searchsorted(keys, budget_keys + day_numbers([b.end_date for b in budgets]), "right")
+    return [Decimal(int(spent)).scaleb(-2) for spent in running[hi] - running[lo]]
+
+
+def attach_spent(budgets, rows):
+    for budget, spent in zip(budgets, spent_amounts(budgets, rows)):
+        budget.spent_amount = spent
+    return budgets
+
+
+def evaluate_budgets(budgets):
+    budgets = list(budgets)
+    if not budgets:
+        return budgets
+    return attach_spent(budgets, list(expense_days(budgets)))
+
+
+def apply_spent(daily):
+    # daily: {(user_id, category_id, day): signed Decimal amount}
+    daily = {key: amount for key, amount in daily.items() if amount}
+    if not daily:
+        return
+    days = [day for _, _, day in daily]
+    budgets = list(
+        Budget.objects.filter(
+            user_id__in={user_id for user_id, _, _ in daily},
+            category_id__in={category_id for _, category_id, _ in daily},
+            start_date__lte=max(days),
+            end_date__gte=min(days),
+        ).only("id", "user_id", "category_id", "start_date", "end_date")
+    )
+    rows = [(*key, amount) for key, amount in daily.items()]
+    for budget, delta in zip(budgets, spent_amounts(budgets, rows)):
+        if delta:
+            Budget.objects.filter(pk=budget.pk).update(
+                spent_amount=F("spent_amount") + delta
+            )
+
+
+def record_spent(added, removed=()):
+    # added/removed: (user_id, date, transaction_type, category_id, amount)
+    # rows, as rollups.ROW_FIELDS.
+    daily = defaultdict(Decimal)
+    for rows, sign in ((added, 1), (removed, -1)):
+        for user_id, when, transaction_type, category_id, amount in rows:
+            if transaction_type == "EXPENSE" and category_id is not None:
+                day = timezone.localtime(when).date()
+                daily[(user_id, category_id, day)] += sign * Decimal(str(amount))
+    apply_spent(daily)
+
+
+def record_spent_frame(frame):
+    # Vectorized counterpart of record_spent for loaded DataFrames.
+    frame = frame[(frame["transaction_type"] == "EXPENSE") & frame["category_id"].notna()]
+    if frame.empty:
+        return
+    grouped = (
+        pd.DataFrame(
+            {
+                "user_id": frame["user_id"].astype("int64"),
+                "category_id": frame["category_id"].astype("int64"),
+                "day": frame["date"].dt.tz_convert(timezone.get_current_timezone()).dt.date,
+                "cents": (frame["amount"].astype(float) * 100).round().astype("int64"),
+            }
+        )
+        .groupby(["user_id", "category_id", "day"])["cents"]
+        .sum()
+    )
+    apply_spent(
+        {
+            (int(user_id), int(category_id), day): Decimal(int(cents)).scaleb(-2)
+            for (user_id, category_id, day), cents in grouped.items()
+        }
+    )
+
+
+def reconcile_budgets(budgets, batch_size=1000):
+    # Recomputes counters from the transactions. Each batch is locked first,
+    # so writes racing with it either land before the recount (and are
+    # included) or wait and apply their delta on top of it.
+    ids = list(budgets.order_by("id").values_list("id", flat=True))
+    corrected = 0
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            batch = list(
+                Budget.objects.select_for_update()
+                .filter(id__in=ids[start:start + batch_size])
+                .order_by("id")
+            )
+            stored = {b.id: b.spent_amount for b in batch}
+            changed = [b for b in evaluate_budgets(batch) if b.spent_amount != stored[b.id]]
+            Budget.objects.bulk_update(changed, ["spent_amount"])
+            corrected += len(changed)
+    return corrected
+
+
+def remaining_amount(budget):
+    return budget.limit_amount - budget.spent_amount
+
+
+def percentage_used(spent, limit):
+    return round((spent / limit) * 100, 2) if limit > 0 else 0
+
+
+def budget_alerts(budgets):
+    # Reads only the counters: active budgets at or past the lowest
+    # threshold, most used first, tagged with the highest threshold crossed.
+    thresholds = sorted(settings.BUDGET_ALERT_THRESHOLDS)
+    alerts = list(
+        budgets.filter(
+            is_active=True,
+            limit_amount__gt=0,
+            spent_amount__gte=F("limit_amount") * Decimal(thresholds[0]) / 100,
+        )
+    )
+    for budget in alerts:
+        budget.threshold = max(
+            t for t in thresholds if budget.spent_amount * 100 >= t * budget.limit_amount
+        )
+    alerts.sort(key=lambda b: b.spent_amount / b.limit_amount, reverse=True)
+    return alerts
@@ -0,0 +1,152 @@
+import pandas as pd
+from django.db import IntegrityError, router, transaction
+from django.db.models.deletion import Collector
+from rest_framework import serializers
+
+from .cache import bump_data_version
+from .categories import resolve_category_ids, with_fresh_categories
+from .db_errors import is_duplicate_transaction
+from .fingerprints import number_occurrences, transaction_fingerprint
+from .models import Transaction
+from .serializers import category_error
+from . import budgets, rollups
+
+UPDATE_FIELDS = [
+    "transaction_type",
+    "amount",
+    "category",
+    "description",
+    "date",
+    "fingerprint",
+]
+DUPLICATE_MESSAGE = "This transaction already exists."
+
+
+def category_ids(items):
+    # One set-based resolution for every category name in the batch.
+    names = {item["category"] for item in items if item.get("category")}
+    if not names:
+        return {}
+    names = pd.Series(sorted(names))
+    return dict(zip(names, resolve_category_ids(names).astype(int)))
+
+
+def bulk_create_transactions(user, items):
+    return with_fresh_categories(lambda: create_batch(user, items))
+
+
+def bulk_update_transactions(queryset, items):
+    return with_fresh_categories(lambda: update_batch(queryset, items))
+
+
+def create_batch(user, items):
+    # Rows already stored are reported as duplicates with the id they
+    # resolve to, so client retries stay harmless. Identical items within
+    # the batch are numbered (fingerprints.number_occurrences) and created.
+    ids_by_name = category_ids(items)
+    objs = []
+    for item in items:
+        item = dict(item)
+        name = item.pop("category", None)
+        objs.append(Transaction(user=user, category_id=ids_by_name.get(name), **item))
+    fingerprints = number_occurrences(
+        transaction_fingerprint(*obj.fingerprint_source()) for obj in objs
+    )
+    for obj, fingerprint in zip(objs, fingerprints):
+        obj.fingerprint = fingerprint
+
+    with transaction.atomic():
+        existing = dict(
+            Transaction.objects.filter(
+                user=user, fingerprint__in=fingerprints
+            ).values_list("fingerprint", "id")
+        )
+        new = [obj for obj in objs if obj.fingerprint not in existing]
+        try:
+            Transaction.objects.bulk_create(new)
+        except IntegrityError as e:
+            if not is_duplicate_transaction(e):
+                raise
+            raise serializers.ValidationError(DUPLICATE_MESSAGE)
+        rollups.record_transactions(new)
+        budgets.record_spent([rollups.transaction_row(obj) for obj in new])
+        if new:
+            bump_data_version(user.id)
+
+    return [
+        {"id": existing[obj.fingerprint], "status": "duplicate"}
+        if obj.fingerprint in existing
+        else {"id": obj.id, "status": "created"}
+        for obj in objs
+    ]
+
+
+def update_batch(queryset, items):
+    ids_by_name = category_ids(items)
+
+    with transaction.atomic():
+        found = queryset.select_for_update(of=("self",)).in_bulk([item["id"] for item in items])
+        previous = [rollups.transaction_row(obj) for obj in found.values()]
+
+        results, errors = [], {}
+        for index, item in enumerate(items):
+            item = dict(item)
+            pk = item.pop("id")
+            obj = found.get(pk)
+            if obj is None:
+                results.append({"id": pk, "status": "not_found"})
+                continue
+            if "category" in item:
+                obj.category_id = ids_by_name.get(item.pop("category"))
+            for field, value in item.items():
+                setattr(obj, field, value)
+            error = category_error(obj.transaction_type, obj.category_id)
+            if error:
+                errors[index] = {"non_field_errors": [error]}
+            obj.refresh_fingerprint()
+            results.append({"id": obj.id, "status": "updated"})
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        try:
+            with transaction.atomic():
+                Transaction.objects.bulk_update(found.values(), UPDATE_FIELDS)
+        except IntegrityError as e:
+            if not is_duplicate_transaction(e):
+                raise
+            raise serializers.ValidationError(DUPLICATE_MESSAGE)
+
+        deltas = rollups.collect_deltas(previous, sign=-1)
+        rollups.collect_deltas(
+            (rollups.transaction_row(obj) for obj in found.values()), deltas=deltas
+        )
+        rollups.apply_deltas(deltas)
+        budgets.record_spent(
+            [rollups.transaction_row(obj) for obj in found.values()], previous
+        )
+        for user_id in {row[0] for row in previous}:
+            bump_data_version(user_id)
+
+    return results
+
+
+def bulk_delete_transactions(queryset, ids):
+    with transaction.atomic():
+        found = queryset.select_for_update(of=("self",)).in_bulk(ids)
+        objs = list(found.values())
+
+        # The per-row delete signal would update rollups and versions once
+        # per transaction; record the whole batch up front instead.
+        for obj in objs:
+            obj._rollup_recorded = True
+        rollups.record_transactions(objs, sign=-1)
+        budgets.record_spent([], [rollups.transaction_row(obj) for obj in objs])
+        collector = Collector(using=router.db_for_write(Transaction))
+        collector.collect(objs)
+        collector.delete()
+        for user_id in {obj.user_id for obj in objs}:
+            bump_data_version(user_id)
+
+    return [
+        {"id": pk, "status": "deleted" if pk in found else "not_found"} for pk in ids
+    ]
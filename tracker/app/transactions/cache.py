@@ -0,0 +1,108 @@
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Budget, Transaction, UserDataVersion
+
+_metrics_lock = threading.Lock()
+_metrics = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+
+def data_version(user_id):
+    return UserDataVersion.objects.filter(user_id=user_id).values_list(
+        "version", "updated_at"
+    ).first() or (0, None)
+
+
+def request_data_version(request):
+    # Memoized on the request so conditional GET and the response cache
+    # share a single lookup.
+    if not hasattr(request, "_data_version"):
+        request._data_version = data_version(request.user.id)
+    return request._data_version
+
+
+def bump_data_version(user_id):
+    updated = UserDataVersion.objects.filter(user_id=user_id).update(
+        version=F("version") + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        UserDataVersion.objects.bulk_create(
+            [UserDataVersion(user_id=user_id, version=1)], ignore_conflicts=True
+        )
+
+
+def bump_category_data_versions(category_id):
+    # Categories are shared, so renaming or deleting one changes the
+    # responses of every user whose transactions or budgets reference it.
+    # One UPDATE covers them all.
+    UserDataVersion.objects.filter(
+        Q(user_id__in=Transaction.objects.filter(category_id=category_id).values("user_id"))
+        | Q(user_id__in=Budget.objects.filter(category_id=category_id).values("user_id"))
+    ).update(version=F("version") + 1, updated_at=timezone.now())
+
+
+async def adata_version(user_id):
+    return await UserDataVersion.objects.filter(user_id=user_id).values_list(
+        "version", "updated_at"
+    ).afirst() or (0, None)
+
+
+def record(endpoint, outcome):
+    with _metrics_lock:
+        _metrics[endpoint][outcome] += 1
+
+
+def cached_for_user(endpoint, request, compute):
+    # Entries are keyed by the user's data version, so a bump makes every
+    # older entry unreachable; stale ones simply expire.
+    version, _ = request_data_version(request)
+    key = f"response:{endpoint}:{request.user.id}:{version}"
+    cache = caches[settings.RESPONSE_CACHE_ALIAS]
+
+    value = cache.get(key)
+    if value is not None:
+        record(endpoint, "hits")
+        return value
+
+    record(endpoint, "misses")
+    value = compute()
+    cache.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value
+
+
+async def acached_for_user(endpoint, request, compute):
+    # Async counterpart of cached_for_user; compute is a coroutine function.
+    version, _ = await adata_version(request.user.id)
+    key = f"response:{endpoint}:{request.user.id}:{version}"
+    cache = caches[settings.RESPONSE_CACHE_ALIAS]
+
+    value = await cache.aget(key)
+    if value is not None:
+        record(endpoint, "hits")
+        return value
+
+    record(endpoint, "misses")
+    value = await compute()
+    await cache.aset(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+    return value
+
+
+def cache_metrics():
+    with _metrics_lock:
+        return {
+            endpoint: {
+                **counts,
+                "hit_ratio": round(counts["hits"] / (counts["hits"] + counts["misses"]), 4),
+            }
+            for endpoint, counts in _metrics.items()
+        }
+
+
+def reset_cache_metrics():
+    with _metrics_lock:
+        _metrics.clear()
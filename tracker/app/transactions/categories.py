@@ -0,0 +1,138 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import SynchronousOnlyOperation
+from django.db import DatabaseError, IntegrityError, connection, transaction
+
+from .db_errors import is_foreign_key_violation
+from .models import Category
+
+DEFAULT_CATEGORY = "Miscellaneous"
+
+
+def normalize_category_name(name):
+    return name.strip().title()
+
+
+def normalize_category_names(names):
+    names = names.astype(object).where(names.notna(), "").astype(str)
+    names = names.str.strip().str.title()
+    return names.mask(names == "", DEFAULT_CATEGORY)
+
+
+class CategoryCache:
+    # Process-wide name -> id map of the (small, global) Category table. Only
+    # committed rows are cached, so a rolled-back insert can never leave a
+    # dangling id behind; the TTL bounds how long edits made by other
+    # processes go unseen.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ids = {}
+        self._loaded_at = None
+
+    def warm(self):
+        ids = dict(Category.objects.values_list("name", "id"))
+        with self._lock:
+            self._ids = ids
+            self._loaded_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._ids = {}
+            self._loaded_at = None
+
+    def _ensure_fresh(self):
+        loaded_at = self._loaded_at
+        if loaded_at is not None and time.monotonic() - loaded_at <= settings.CATEGORY_CACHE_TTL:
+            return
+        if not connection.in_atomic_block:
+            self.warm()
+            return
+        # Inside a transaction the table may hold uncommitted rows, so rather
+        # than reloading, drop expired entries and let committed stores refill.
+        with self._lock:
+            if loaded_at is not None:
+                self._ids = {}
+            self._loaded_at = time.monotonic()
+
+    def _store(self, name, category_id):
+        with self._lock:
+            for cached_name, cached_id in list(self._ids.items()):
+                if cached_id == category_id and cached_name != name:
+                    del self._ids[cached_name]
+            self._ids[name] = category_id
+
+    def store(self, name, category_id):
+        transaction.on_commit(lambda: self._store(name, category_id))
+
+    def forget(self, category_id):
+        with self._lock:
+            self._ids = {n: i for n, i in self._ids.items() if i != category_id}
+
+    def lookup(self, names):
+        self._ensure_fresh()
+        with self._lock:
+            return {name: self._ids[name] for name in names if name in self._ids}
+
+    def get_id(self, name):
+        name = normalize_category_name(name)
+        category_id = self.lookup([name]).get(name)
+        if category_id is None:
+            # get_or_create absorbs a concurrent insert of the same name.
+            category_id = Category.objects.get_or_create(name=name)[0].id
+            self.store(name, category_id)
+        return category_id
+
+
+category_cache = CategoryCache()
+
+
+def warm_category_cache():
+    # Called once per server process; a database that is not migrated or
+    # reachable yet, or an ASGI server importing the app from inside its
+    # event loop, just means the cache fills lazily instead.
+    try:
+        category_cache.warm()
+    except (DatabaseError, SynchronousOnlyOperation):
+        pass
+
+
+def get_category_id(name):
+    return category_cache.get_id(name)
+
+
+def with_fresh_categories(write):
+    # A category deleted by another process stays cached for up to
+    # CATEGORY_CACHE_TTL; its id then fails the (deferred) foreign key check
+    # when the write commits. Drop the cache and retry the write once.
+    try:
+        return write()
+    except IntegrityError as e:
+        if not is_foreign_key_violation(e):
+            raise
+        category_cache.clear()
+        return write()
+
+
+def resolve_category_ids(names):
+    # Cached names cost nothing; the rest take one IN query and one bulk
+    # insert, instead of a get_or_create per row.
+    names = normalize_category_names(names)
+    wanted = set(names.unique())
+
+    ids = category_cache.lookup(wanted)
+    missing = wanted - ids.keys()
+    if missing:
+        Category.objects.bulk_create(
+            [Category(name=name) for name in missing], ignore_conflicts=True
+        )
+        found = dict(
+            Category.objects.filter(name__in=missing).values_list("name", "id")
+        )
+        for name, category_id in found.items():
+            category_cache.store(name, category_id)
+        ids.update(found)
+
+    return names.map(ids)
@@ -0,0 +1,114 @@
+import asyncio
+from collections import defaultdict
+
+from django.db.models import Q, Sum
+
+from .budgets import percentage_used
+from .models import Budget, MonthlyRollup
+
+BUDGET_PERIODS = {"monthly": "MONTHLY", "yearly": "YEARLY"}
+
+
+def monthly_totals(user):
+    # One grouped scan over the rollups: income and expense per month via
+    # conditional sums.
+    return (
+        MonthlyRollup.objects.filter(user=user)
+        .values("month")
+        .annotate(
+            income=Sum("total", filter=Q(transaction_type="INCOME")),
+            expense=Sum("total", filter=Q(transaction_type="EXPENSE")),
+        )
+        .order_by("month")
+    )
+
+
+def monthly_expenses(user):
+    return (
+        MonthlyRollup.objects.filter(user=user, transaction_type="EXPENSE")
+        .values("month")
+        .annotate(total_amount=Sum("total"))
+        .order_by("month")
+    )
+
+
+def shape_monthly_expenses(rows):
+    return {row["month"].strftime("%B %Y"): float(row["total_amount"]) for row in rows}
+
+
+def active_budgets(user):
+    return Budget.objects.filter(user=user, is_active=True).select_related("category")
+
+
+def build_dashboard(user):
+    return shape_dashboard(list(monthly_totals(user)), list(active_budgets(user)))
+
+
+async def abuild_dashboard(user):
+    # The two queries are independent, so they are awaited together.
+    async def fetch(queryset):
+        return [row async for row in queryset]
+
+    months, budgets = await asyncio.gather(
+        fetch(monthly_totals(user)), fetch(active_budgets(user))
+    )
+    return shape_dashboard(months, budgets)
+
+
+def shape_dashboard(months, budgets):
+    income_total = sum((m["income"] or 0 for m in months), 0)
+    expense_total = sum((m["expense"] or 0 for m in months), 0)
+
+    # Utilization is what was spent inside each budget's own window, so
+    # weekly and custom budgets count as well as monthly and yearly ones.
+    limits = defaultdict(int)
+    spent = defaultdict(int)
+    budget_lists = defaultdict(list)
+    for b in budgets:
+        limits[b.period] += b.limit_amount
+        spent[b.period] += b.spent_amount
+        budget_lists[b.period].append(
+            {
+                "category": b.category.name,
+                "limit_amount": float(b.limit_amount),
+                "spent_amount": float(b.spent_amount),
+                "percentage_used": float(percentage_used(b.spent_amount, b.limit_amount)),
+            }
+        )
+
+    kpis = {
+        "total_income": float(income_total),
+        "total_expense": float(expense_total),
+        "net_savings": float(income_total - expense_total),
+        "budget_used_percentage": float(
+            percentage_used(sum(spent.values()), sum(limits.values()))
+        ),
+    }
+    for db_period, _ in Budget.PERIOD_CHOICES:
+        kpis[f"{db_period.lower()}_budget_used"] = float(
+            percentage_used(spent[db_period], limits[db_period])
+        )
+
+    series = {
+        period: {"expenses": defaultdict(float), "income": defaultdict(float)}
+        for period in BUDGET_PERIODS
+    }
+    for m in months:
+        labels = {"monthly": m["month"].strftime("%b"), "yearly": str(m["month"].year)}
+        for period, label in labels.items():
+            if m["expense"] is not None:
+                series[period]["expenses"][label] += float(m["expense"])
+            if m["income"] is not None:
+                series[period]["income"][label] += float(m["income"])
+
+    return {
+        "kpis": kpis,
+        **{
+            period: {
+                "expenses": dict(series[period]["expenses"]),
+                "income": dict(series[period]["income"]),
+                "budget": budget_lists[db_period] if months else [],
+            }
+            for period, db_period in BUDGET_PERIODS.items()
+        },
+    }
@@ -0,0 +1,20 @@
+# Telling IntegrityErrors apart by what the database reports about them.
+
+FINGERPRINT_CONSTRAINT = "unique_transaction_fingerprint"
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def diagnostics(error):
+    return getattr(error.__cause__, "diag", None)
+
+
+def constraint_name(error):
+    return getattr(diagnostics(error), "constraint_name", None)
+
+
+def is_duplicate_transaction(error):
+    return constraint_name(error) == FINGERPRINT_CONSTRAINT
+
+
+def is_foreign_key_violation(error):
+    return getattr(diagnostics(error), "sqlstate", None) == FOREIGN_KEY_VIOLATION
@@ -1,8 +1,46 @@
 import pandas as pd
 from .logging import logger
 
+CSV_EXTENSIONS = (".csv",)
+EXCEL_EXTENSIONS = (".xls", ".xlsx")
 
-def extract_csv(file_path):
-    logger.info(f"Reading CSV file: {file_path}")
-    df = pd.read_csv(file_path)
-    return df
+
+def is_supported(filename):
+    return str(filename).endswith(CSV_EXTENSIONS + EXCEL_EXTENSIONS)
+
+
+def extract_chunks(source, chunksize, filename=None):
+    filename = str(filename or source)
+    logger.info(f"Streaming file in chunks of {chunksize} rows: {filename}")
+
+    if filename.endswith(CSV_EXTENSIONS):
+        with pd.read_csv(source, chunksize=chunksize) as reader:
+            yield from reader
+    elif filename.endswith(".xlsx"):
+        yield from extract_xlsx_chunks(source, chunksize)
+    elif filename.endswith(EXCEL_EXTENSIONS):
+        # Legacy .xls workbooks cannot be read incrementally.
+        df = pd.read_excel(source)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    else:
+        raise ValueError("Unsupported file type")
+
+
+def extract_xlsx_chunks(source, chunksize):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        columns = list(next(rows, ()))
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                yield pd.DataFrame(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns)
+    finally:
+        workbook.close()
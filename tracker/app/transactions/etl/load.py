@@ -1,46 +1,150 @@
-from transactions.models import Transaction, Category
+import io
+
+import pandas as pd
+from django.conf import settings
+from django.db import connection
+from transactions.models import Transaction
+from transactions.categories import resolve_category_ids
+from transactions.rollups import record_frame
+from transactions.budgets import record_spent_frame
+from transactions.fingerprints import frame_fingerprints
+from transactions.cache import bump_data_version
 from django.db import transaction as db_transaction
 from .logging import logger
 
+COPY_COLUMNS = [
+    "user_id",
+    "transaction_type",
+    "amount",
+    "category_id",
+    "description",
+    "date",
+    "fingerprint",
+]
+
+
+def optional(series):
+    return series.astype(object).where(series.notna(), None)
+
+
+def prepare_frame(df, user, seen=None):
+    is_expense = df["transaction_type"] == "EXPENSE"
+    category_ids = pd.Series(pd.NA, index=df.index, dtype="Int64")
+    category_ids[is_expense.to_numpy()] = resolve_category_ids(
+        df.loc[is_expense, "category"]
+    ).to_numpy()
+
+    frame = pd.DataFrame(
+        {
+            "user_id": user.id,
+            "transaction_type": df["transaction_type"],
+            "amount": df["amount"].round(2),
+            "category_id": optional(category_ids),
+            "description": optional(df["description"]),
+            "date": df["date"],
+        },
+        index=df.index,
+    )
+    frame["fingerprint"] = frame_fingerprints(frame, seen)
+    return frame
+
+
+def drop_duplicates(frame, user):
+    # One set-based lookup per batch; rows already present are skipped
+    # instead of inserted again. Repeats within the import carry their
+    # occurrence number and are distinct rows.
+    existing = set(
+        Transaction.objects.filter(
+            user=user, fingerprint__in=list(frame["fingerprint"])
+        ).values_list("fingerprint", flat=True)
+    )
+    return frame[~frame["fingerprint"].isin(existing)]
 
-def load_transactions(df, user):
-    logger.info(f"Loading transactions into DB | user={user.username}")
 
-    transactions_to_create = []
+def bulk_create_rows(frame, batch_size=None):
+    Transaction.objects.bulk_create(
+        [Transaction(**row) for row in frame.to_dict("records")],
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    return frame
 
-    for _, row in df.iterrows():
-        category_obj = None
 
-        if row["transaction_type"] == "EXPENSE":
-            category_name = row["category"]
+def copy_rows(frame, batch_size=None):
+    # Stream the frame through COPY FROM STDIN into a staging table, then
+    # move it over with ON CONFLICT DO NOTHING so concurrent imports of the
+    # same rows cannot fail the batch. The buffer is bounded by the import
+    # chunk size.
+    if connection.vendor != "postgresql":
+        raise ValueError("The copy load strategy requires PostgreSQL")
 
-            if not category_name or str(category_name).strip() == "":
-                category_name = "Miscellaneous"
+    buffer = io.StringIO()
+    frame[COPY_COLUMNS].to_csv(
+        buffer, index=False, header=False, date_format="%Y-%m-%d %H:%M:%S.%f%z"
+    )
+    buffer.seek(0)
 
-            category_obj, _ = Category.objects.get_or_create(
-                name=category_name,
-                user=user
-            )
+    quote = connection.ops.quote_name
+    table = quote(Transaction._meta.db_table)
+    columns = ", ".join(
+        quote(Transaction._meta.get_field(name).column) for name in COPY_COLUMNS
+    )
+    copy_sql = f"COPY transaction_staging ({columns}) FROM STDIN WITH (FORMAT csv)"
 
-        transactions_to_create.append(
-            Transaction(
-                user=user,
-                transaction_type=row["transaction_type"],
-                amount=row["amount"],
-                category=category_obj,
-                description=row["description"],
-                date=row["date"],
-            )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE transaction_staging ON COMMIT DROP AS "
+            f"SELECT {columns} FROM {table} WITH NO DATA"
         )
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, "copy_expert"):
+            raw_cursor.copy_expert(copy_sql, buffer)
+        else:
+            with raw_cursor.copy(copy_sql) as copy:
+                copy.write(buffer.getvalue())
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM transaction_staging "
+            f"ON CONFLICT DO NOTHING RETURNING {quote('fingerprint')}"
+        )
+        inserted = {row[0] for row in cursor.fetchall()}
+        cursor.execute("DROP TABLE transaction_staging")
+    return frame[frame["fingerprint"].isin(inserted)]
+
+
+LOAD_STRATEGIES = {
+    "bulk_create": bulk_create_rows,
+    "copy": copy_rows,
+}
+
+
+def load_transactions(df, user, strategy=None, batch_size=None, seen=None):
+    # seen numbers repeated rows across the chunks of one import; see
+    # fingerprints.number_occurrences.
+    strategy = strategy or settings.TRANSACTION_LOAD_STRATEGY
+    if strategy not in LOAD_STRATEGIES:
+        raise ValueError(f"Unknown load strategy: {strategy}")
+
+    logger.info(
+        f"Loading transactions into DB | user={user.username} | strategy={strategy}"
+    )
+
+    frame = prepare_frame(df, user, seen)
 
     try:
         with db_transaction.atomic():
-            Transaction.objects.bulk_create(transactions_to_create)
+            new_rows = drop_duplicates(frame, user)
+            inserted = LOAD_STRATEGIES[strategy](new_rows, batch_size=batch_size)
+            record_frame(inserted)
+            record_spent_frame(inserted)
+            if len(inserted):
+                bump_data_version(user.id)
 
+        result = {"inserted": len(inserted), "duplicates": len(frame) - len(inserted)}
         logger.info(
-            f"Loaded {len(transactions_to_create)} transactions | user={user.username}"
+            f"Loaded {result['inserted']} transactions, skipped {result['duplicates']} duplicates "
+            f"| user={user.username}"
         )
-        return len(transactions_to_create)
+        return result
 
     except Exception as e:
         logger.error(
@@ -1,20 +1,262 @@
-from .extract import extract_csv
+import json
+import os
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from django.conf import settings
+from django.utils import timezone
+
+from transactions.models import EtlRun
+from .extract import extract_chunks
 from .transform import transform_transaction
 from .load import load_transactions
 from .logging import logger
 
+STAGES = ("extract", "transform", "load")
+PAGE_MB = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024) if hasattr(os, "sysconf") else 0
 
-def run_pipeline(file_path, user):
 
-    logger.info(f"Starting ETL pipeline for user: {user.username} | file={file_path}")
+def rss_mb():
+    # Resident set size from /proc; None where it does not exist (macOS).
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE_MB
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+@contextmanager
+def traced_memory():
+    # Python-level allocations (numpy and pandas buffers included). Tracing
+    # hooks every allocation and slows the pipeline several times over, so
+    # run_instrumented only enables it on request.
+    if tracemalloc.is_tracing():
+        yield
+        return
+    tracemalloc.start()
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
+
+
+def grow(stats, key, mb):
+    if mb is not None:
+        stats[key] = round(max(stats[key] or 0.0, mb), 3)
+
+
+@contextmanager
+def stage(progress, name, rows_in=0):
+    # Memory is what a single pass of the stage added to what it started
+    # with, so it does not carry over from earlier stages or earlier runs in
+    # the same worker process: rss_delta_mb always (resident memory after
+    # minus before), peak_memory_mb only while tracing allocations.
+    stats = progress["stages"][name]
+    stats["rows_in"] += rows_in
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    rss_before = rss_mb()
+    started = time.perf_counter()
+    try:
+        yield stats
+    finally:
+        stats["seconds"] += time.perf_counter() - started
+        rss_after = rss_mb()
+        if rss_before is not None and rss_after is not None:
+            grow(stats, "rss_delta_mb", rss_after - rss_before)
+        if tracing:
+            grow(
+                stats,
+                "peak_memory_mb",
+                (tracemalloc.get_traced_memory()[1] - baseline) / (1024 * 1024),
+            )
+
+
+def new_progress():
+    return {
+        "chunks": 0,
+        "rows": 0,
+        "imported": 0,
+        "duplicates": 0,
+        "dropped": 0,
+        "stages": {
+            name: {
+                "seconds": 0.0,
+                "rows_in": 0,
+                "rows_out": 0,
+                "rss_delta_mb": None,
+                "peak_memory_mb": None,
+            }
+            for name in STAGES
+        },
+    }
+
+
+def import_transactions(
+    source,
+    user,
+    chunksize=None,
+    filename=None,
+    on_chunk=None,
+    strategy=None,
+    progress=None,
+):
+    chunksize = chunksize or settings.TRANSACTION_IMPORT_CHUNK_SIZE
+    progress = progress if progress is not None else new_progress()
+
+    # Each chunk is transformed and loaded in its own batch so peak memory
+    # depends on the chunk size, not the file size. Time spent pulling the
+    # next chunk out of the reader is charged to the extract stage.
+    chunks = extract_chunks(source, chunksize, filename=filename)
+    seen = Counter()
+    while True:
+        with stage(progress, "extract") as stats:
+            chunk = next(chunks, None)
+            rows = 0 if chunk is None else len(chunk)
+            stats["rows_in"] += rows
+            stats["rows_out"] += rows
+        if chunk is None:
+            break
+        progress["chunks"] += 1
+        progress["rows"] += len(chunk)
+
+        with stage(progress, "transform", rows_in=len(chunk)) as stats:
+            df = transform_transaction(chunk)
+            stats["rows_out"] += len(df)
+        progress["dropped"] += len(chunk) - len(df)
 
-    df = extract_csv(file_path)
-    logger.info(f"Extracted {len(df)} rows")
+        with stage(progress, "load", rows_in=len(df)) as stats:
+            result = load_transactions(df, user, strategy=strategy, seen=seen)
+            stats["rows_out"] += result["inserted"]
+        progress["imported"] += result["inserted"]
+        progress["duplicates"] += result["duplicates"]
+
+        logger.info(
+            f"Chunk {progress['chunks']} done | rows={progress['rows']} "
+            f"imported={progress['imported']} duplicates={progress['duplicates']} "
+            f"| user={user.username}"
+        )
+        if on_chunk:
+            on_chunk(progress)
+
+    return progress
+
+
+def stage_report(progress):
+    report = {}
+    for name, stats in progress["stages"].items():
+        seconds = stats["seconds"]
+        report[name] = {
+            **stats,
+            "seconds": round(seconds, 4),
+            "rows_per_second": round(stats["rows_in"] / seconds, 1) if seconds else None,
+            "rows_dropped": stats["rows_in"] - stats["rows_out"],
+        }
+    return report
+
+
+def run_report(run):
+    return {
+        "id": run.id,
+        "user": run.user.username if run.user else None,
+        "source": run.source,
+        "strategy": run.strategy,
+        "status": run.status,
+        "started_at": run.started_at.isoformat(),
+        "duration_seconds": run.duration_seconds,
+        "rows": run.rows,
+        "imported": run.imported,
+        "duplicates": run.duplicates,
+        "dropped": run.dropped,
+        "chunks": run.chunks,
+        "peak_memory_mb": run.peak_memory_mb,
+        "stages": run.stages,
+        "error": run.error,
+    }
+
+
+def run_instrumented(
+    source,
+    user,
+    chunksize=None,
+    strategy=None,
+    filename=None,
+    raise_errors=True,
+    trace_memory=None,
+):
+    """Run the import and record it as an EtlRun with per-stage metrics.
+
+    A failed run is recorded with whatever it got through, then re-raised
+    unless raise_errors is False. Allocations are traced for peak memory
+    only with trace_memory (default: settings.ETL_TRACE_MEMORY).
+    """
+    strategy = strategy or settings.TRANSACTION_LOAD_STRATEGY
+    if trace_memory is None:
+        trace_memory = settings.ETL_TRACE_MEMORY
+    run = EtlRun(
+        user=user,
+        source=str(filename or source)[:255],
+        strategy=strategy,
+        started_at=timezone.now(),
+    )
+    progress = new_progress()
+
+    started = time.perf_counter()
+    try:
+        with traced_memory() if trace_memory else nullcontext():
+            import_transactions(
+                source,
+                user,
+                chunksize=chunksize,
+                filename=filename,
+                strategy=strategy,
+                progress=progress,
+            )
+        run.status = "COMPLETED"
+    except Exception as e:
+        logger.exception(f"ETL run failed | user={user.username} | source={run.source}")
+        run.status = "FAILED"
+        run.error = str(e)
+        if raise_errors:
+            raise
+    finally:
+        run.duration_seconds = round(time.perf_counter() - started, 4)
+        run.finished_at = timezone.now()
+        run.rows = progress["rows"]
+        run.imported = progress["imported"]
+        run.duplicates = progress["duplicates"]
+        run.dropped = progress["dropped"]
+        run.chunks = progress["chunks"]
+        peaks = [
+            stats["peak_memory_mb"]
+            for stats in progress["stages"].values()
+            if stats["peak_memory_mb"] is not None
+        ]
+        run.peak_memory_mb = max(peaks) if peaks else None
+        run.stages = stage_report(progress)
+        run.save()
+        logger.info(f"ETL run report {json.dumps(run_report(run))}")
+    return run
+
+
+def run_pipeline(file_path, user, chunksize=None, strategy=None):
+
+    logger.info(f"Starting ETL pipeline for user: {user.username} | file={file_path}")
 
-    df = transform_transaction(df)
+    run = run_instrumented(file_path, user, chunksize=chunksize, strategy=strategy)
+    logger.info(
+        f"Extracted {run.rows} rows in {run.chunks} chunks"
+    )
 
-    count = load_transactions(df, user)
-    logger.info(f"Loaded {count} transactions into the database")
+    count = run.imported
+    logger.info(
+        f"Loaded {count} transactions into the database, "
+        f"skipped {run.duplicates} duplicates"
+    )
 
     logger.info(f"ETL pipeline completed for user: {user.username}")
     return f" Imported {count} transactions for {user.username}"
@@ -1,6 +1,8 @@
+import numpy as np
 import pandas as pd
 from .logging import logger
 from django.utils import timezone
+from transactions.categories import normalize_category_names
 
 EXPENSE_CATEGORIES = [
     "Food",
@@ -20,36 +22,22 @@ def transform_transaction(df):
 
     logger.info("Starting transformation")
 
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
-    invalid_dates = df["date"].isna().sum()
+    dates = pd.to_datetime(df["date"], errors="coerce")
+    invalid_dates = dates.isna().sum()
 
     if invalid_dates:
         logger.warning(f"Dropping {invalid_dates} rows with invalid dates")
 
-    df = df.dropna(subset=["date"])
+    df = df.assign(date=dates).loc[dates.notna()]
 
-    df["date"] = df["date"].apply(
-        lambda d: timezone.make_aware(d) if timezone.is_naive(d) else d
-    )
+    if df["date"].dt.tz is None:
+        df["date"] = df["date"].dt.tz_localize(timezone.get_current_timezone())
 
     df["description"] = df["description"].replace({"None": None})
 
-    df["category"] = df["category"].apply(
-        lambda x: (
-            str(x).strip().title()
-            if pd.notna(x) and str(x).strip() != ""
-            else "Miscellaneous"
-        )
-    )
+    df["category"] = normalize_category_names(df["category"])
 
-    def get_type(row):
-        return "EXPENSE" if row["amount"] < 0 else "INCOME"
-
-    df["transaction_type"] = df.apply(get_type, axis=1)
-
-    df.loc[
-        (df["transaction_type"] == "EXPENSE") & (df["category"].isna()), "category"
-    ] = "Miscellaneous"
+    df["transaction_type"] = np.where(df["amount"] < 0, "EXPENSE", "INCOME")
 
     df["amount"] = df["amount"].abs()
 
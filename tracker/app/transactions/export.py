@@ -0,0 +1,108 @@
+import csv
+import io
+from itertools import islice
+
+EXPORT_FIELDS = (
+    "id",
+    "date",
+    "transaction_type",
+    "amount",
+    "category__name",
+    "description",
+)
+EXPORT_HEADER = ("id", "date", "transaction_type", "amount", "category", "description")
+
+
+def export_rows(queryset, chunk_size):
+    # values_list + iterator: no model instances and, on PostgreSQL, a
+    # server-side cursor, so only one chunk of rows is held at a time.
+    return queryset.values_list(*EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_stream(rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_HEADER)
+    for id_, date, transaction_type, amount, category, description in rows:
+        yield writer.writerow(
+            [id_, date.isoformat(), transaction_type, amount, category, description]
+        )
+
+
+class ChunkSink(io.RawIOBase):
+    # Write-only file handed to the Parquet writer; whatever it has
+    # written so far is drained after every row group.
+
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def parquet_schema():
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("id", pa.int64()),
+            ("date", pa.timestamp("us", tz="UTC")),
+            ("transaction_type", pa.string()),
+            ("amount", pa.decimal128(10, 2)),
+            ("category", pa.string()),
+            ("description", pa.string()),
+        ]
+    )
+
+
+def parquet_stream(rows, chunk_size):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = parquet_schema()
+    sink = ChunkSink()
+    writer = pq.ParquetWriter(sink, schema)
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        writer.write_batch(
+            pa.record_batch(
+                [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), schema)],
+                schema=schema,
+            )
+        )
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def parquet_available():
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", lambda rows, chunk_size: csv_stream(rows)),
+    "parquet": ("application/vnd.apache.parquet", parquet_stream),
+}
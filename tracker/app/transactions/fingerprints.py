@@ -0,0 +1,73 @@
+import hashlib
+from collections import Counter
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+
+from django.utils import timezone
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def fingerprint_key(user_id, transaction_type, date, amount, description):
+    return "|".join(
+        [
+            str(user_id),
+            transaction_type or "",
+            date,
+            f"{Decimal(str(amount)):.2f}",
+            hashlib.sha256((description or "").encode()).hexdigest(),
+        ]
+    )
+
+
+def digest(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def transaction_fingerprint(user_id, transaction_type, date, amount, description):
+    if timezone.is_naive(date):
+        date = timezone.make_aware(date)
+    return digest(
+        fingerprint_key(
+            user_id,
+            transaction_type,
+            date.astimezone(dt_timezone.utc).strftime(DATE_FORMAT),
+            amount,
+            description,
+        )
+    )
+
+
+def number_occurrences(fingerprints, seen=None):
+    # A statement may list the same transaction twice (two coffees at the
+    # same time). Within one import the n-th repeat of a row gets its own
+    # fingerprint, so repeats are kept while re-importing the same file
+    # still matches row for row. The first occurrence keeps the plain
+    # fingerprint, as single saves compute it. Pass the same seen Counter
+    # for every chunk of an import.
+    seen = Counter() if seen is None else seen
+    numbered = []
+    for fingerprint in fingerprints:
+        occurrence = seen[fingerprint]
+        seen[fingerprint] += 1
+        numbered.append(digest(f"{fingerprint}|{occurrence}") if occurrence else fingerprint)
+    return numbered
+
+
+def frame_fingerprints(frame, seen=None):
+    # Same fingerprint as transaction_fingerprint, with the date formatting
+    # done column-wise; only the hashing runs per row.
+    dates = frame["date"].dt.tz_convert("UTC").dt.strftime(DATE_FORMAT)
+    return number_occurrences(
+        (
+            digest(fingerprint_key(*row))
+            for row in zip(
+                frame["user_id"],
+                frame["transaction_type"],
+                dates,
+                frame["amount"],
+                frame["description"],
+            )
+        ),
+        seen,
+    )
@@ -0,0 +1,78 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import ImportJob
+from transactions.etl.pipeline import import_transactions
+
+logger = logging.getLogger(__name__)
+
+
+def claim_next_job():
+    # SKIP LOCKED lets several workers poll the same table without
+    # picking up the same job. A RUNNING job without a heartbeat for
+    # IMPORT_JOB_STALE_AFTER seconds lost its worker and is claimed again;
+    # rows it already imported are skipped as duplicates.
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMPORT_JOB_STALE_AFTER)
+    with transaction.atomic():
+        job = (
+            ImportJob.objects.select_for_update(skip_locked=True)
+            .filter(Q(status="PENDING") | Q(status="RUNNING", heartbeat_at__lt=stale))
+            .order_by("created_at")
+            .first()
+        )
+        if job is None:
+            return None
+        if job.status == "RUNNING":
+            logger.warning(f"Reclaiming import job {job.pk} from a stalled worker")
+        job.status = "RUNNING"
+        job.started_at = job.heartbeat_at = now
+        job.save(update_fields=["status", "started_at", "heartbeat_at"])
+    return job
+
+
+def run_job(job):
+    def record_progress(progress):
+        ImportJob.objects.filter(pk=job.pk).update(
+            rows_processed=progress["rows"],
+            rows_imported=progress["imported"],
+            duplicates=progress["duplicates"],
+            chunks=progress["chunks"],
+            heartbeat_at=timezone.now(),
+        )
+
+    try:
+        with job.file.open("rb") as source:
+            progress = import_transactions(
+                source, job.user, filename=job.filename, on_chunk=record_progress
+            )
+        job.rows_processed = progress["rows"]
+        job.rows_imported = progress["imported"]
+        job.duplicates = progress["duplicates"]
+        job.chunks = progress["chunks"]
+        job.status = "COMPLETED"
+    except Exception as e:
+        logger.exception(f"Import job {job.pk} failed")
+        job.refresh_from_db(
+            fields=["rows_processed", "rows_imported", "duplicates", "chunks"]
+        )
+        job.status = "FAILED"
+        job.error = str(e)
+
+    job.finished_at = timezone.now()
+    job.save()
+    # The upload is only needed until it has been imported.
+    job.file.storage.delete(job.file.name)
+    return job
+
+
+def process_next_job():
+    job = claim_next_job()
+    if job is not None:
+        run_job(job)
+    return job
@@ -0,0 +1,29 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions.rollups import rebuild_monthly_rollups
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Rebuild the per-user monthly transaction rollups from scratch"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only rebuild rollups for this username (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        users = None
+        if options["usernames"]:
+            users = list(User.objects.filter(username__in=options["usernames"]))
+            missing = set(options["usernames"]) - {u.username for u in users}
+            if missing:
+                raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+
+        count = rebuild_monthly_rollups(users)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} monthly rollups"))
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from transactions.budgets import reconcile_budgets
+from transactions.models import Budget
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = "Recompute every budget's spent_amount counter from its transactions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            help="Only reconcile budgets of this username (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        budgets = Budget.objects.all()
+        if options["usernames"]:
+            users = list(User.objects.filter(username__in=options["usernames"]))
+            missing = set(options["usernames"]) - {u.username for u in users}
+            if missing:
+                raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+            budgets = budgets.filter(user__in=users)
+
+        corrected = reconcile_budgets(budgets)
+        self.stdout.write(
+            self.style.SUCCESS(f"Reconciled {budgets.count()} budgets, corrected {corrected}")
+        )
@@ -0,0 +1,158 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from transactions.etl.logging import logger
+from transactions.etl.load import LOAD_STRATEGIES
+from transactions.etl.pipeline import run_instrumented, run_report
+
+User = get_user_model()
+
+DEFAULT_CSV_DIR = os.path.join(settings.BASE_DIR, "scripts", "user_transactions")
+
+
+def close_connections():
+    # Workers must not share the parent's database sockets. A psycopg pool
+    # is dropped as well: its worker threads do not survive the fork, so
+    # each process builds its own on first use.
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        if connection.settings_dict["OPTIONS"].get("pool"):
+            connection.close_pool()
+
+
+def run_user_pipeline(user_id, csv_file, chunksize=None, strategy=None, trace_memory=None):
+    started = time.perf_counter()
+    result = {
+        "user_id": user_id,
+        "file": csv_file,
+        "imported": 0,
+        "error": None,
+        "report": None,
+    }
+    try:
+        user = User.objects.get(pk=user_id)
+        result["username"] = user.username
+        run = run_instrumented(
+            csv_file,
+            user,
+            chunksize=chunksize,
+            strategy=strategy,
+            raise_errors=False,
+            trace_memory=trace_memory,
+        )
+        result["imported"] = run.imported
+        result["report"] = run_report(run)
+        result["error"] = run.error or None
+    except Exception as e:
+        logger.exception(f"ETL failed | user_id={user_id} | file={csv_file}")
+        result["error"] = str(e)
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+class Command(BaseCommand):
+    help = "Run the ETL pipeline for every user with a CSV file, in parallel"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (1 runs in-process)",
+        )
+        parser.add_argument("--csv-dir", default=DEFAULT_CSV_DIR)
+        parser.add_argument("--chunksize", type=int, default=None)
+        parser.add_argument(
+            "--strategy",
+            choices=sorted(LOAD_STRATEGIES),
+            default=None,
+            help="Load strategy (defaults to settings.TRANSACTION_LOAD_STRATEGY)",
+        )
+        parser.add_argument(
+            "--trace-memory",
+            action="store_true",
+            default=None,
+            help="Trace allocations for per-stage peak memory (slow; "
+            "defaults to settings.ETL_TRACE_MEMORY)",
+        )
+        parser.add_argument(
+            "--report",
+            help="Write the per-run stage reports (JSON) to this path",
+        )
+
+    def handle(self, *args, **options):
+        csv_dir = options["csv_dir"]
+        jobs = []
+        for user_id, username in User.objects.values_list("id", "username"):
+            csv_file = os.path.join(csv_dir, f"fake_transactions_{username}.csv")
+            if os.path.exists(csv_file):
+                jobs.append((user_id, csv_file))
+            else:
+                self.stdout.write(f"CSV not found for {username}")
+
+        started = time.perf_counter()
+        results = self.run_jobs(
+            jobs,
+            options["workers"],
+            options["chunksize"],
+            options["strategy"],
+            options["trace_memory"],
+        )
+        elapsed = time.perf_counter() - started
+
+        failed = [r for r in results if r["error"]]
+        for r in results:
+            status = f"FAILED: {r['error']}" if r["error"] else f"{r['imported']} rows"
+            self.stdout.write(f"{r.get('username', r['user_id'])}: {status} ({r['seconds']}s)")
+
+        imported = sum(r["imported"] for r in results)
+        summary = (
+            f"Processed {len(results)} users in {elapsed:.2f}s | "
+            f"imported={imported} | failed={len(failed)} | "
+            f"{imported / elapsed if elapsed else 0:.0f} rows/s"
+        )
+        style = self.style.ERROR if failed else self.style.SUCCESS
+        self.stdout.write(style(summary))
+
+        if options["report"]:
+            with open(options["report"], "w") as f:
+                json.dump(
+                    {
+                        "seconds": round(elapsed, 3),
+                        "imported": imported,
+                        "failed": len(failed),
+                        "runs": [r["report"] for r in results if r["report"]],
+                    },
+                    f,
+                    indent=2,
+                )
+
+    def run_jobs(self, jobs, workers, chunksize, strategy, trace_memory):
+        if workers <= 1 or len(jobs) <= 1:
+            return [
+                run_user_pipeline(user_id, path, chunksize, strategy, trace_memory)
+                for user_id, path in jobs
+            ]
+
+        close_connections()
+        # fork keeps the configured Django app registry in every worker.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=close_connections,
+        ) as pool:
+            futures = [
+                pool.submit(
+                    run_user_pipeline, user_id, path, chunksize, strategy, trace_memory
+                )
+                for user_id, path in jobs
+            ]
+            return [future.result() for future in as_completed(futures)]
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from transactions.jobs import process_next_job
+
+
+class Command(BaseCommand):
+    help = "Process queued transaction import jobs, polling the database for new ones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when the queue is empty",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the queue and exit instead of polling forever",
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            close_old_connections()
+            job = process_next_job()
+            if job is not None:
+                self.stdout.write(
+                    f"Job {job.pk} {job.status.lower()}: {job.rows_imported} imported, "
+                    f"{job.duplicates} duplicates ({job.rows_per_second} rows/s)"
+                )
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["poll_interval"])
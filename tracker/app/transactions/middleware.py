@@ -0,0 +1,189 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger("instrumentation")
+
+# Upper bounds (ms) of the wall-time histogram buckets; the last is open.
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+_metrics_lock = threading.Lock()
+_metrics = {}
+
+# Serialization time of the request being instrumented: serializers are
+# often built without the request in their context.
+_serialization = contextvars.ContextVar("serialization", default=None)
+
+
+class QueryTimer:
+    # Installed with connection.execute_wrapper for the length of a request.
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started
+            self.count += 1
+
+
+def instrument_serializers():
+    # Every serializer, list serializers included, produces its output
+    # through BaseSerializer.data; the wrapper times it for the request
+    # being instrumented. Installed once, when the middleware is enabled.
+    data = BaseSerializer.data.fget
+    if getattr(data, "instrumented", False):
+        return
+
+    def timed_data(serializer):
+        state = _serialization.get()
+        if state is None or state["depth"]:
+            return data(serializer)
+        state["depth"] += 1
+        started = time.perf_counter()
+        try:
+            return data(serializer)
+        finally:
+            state["ms"] += (time.perf_counter() - started) * 1000
+            state["depth"] -= 1
+
+    timed_data.instrumented = True
+    BaseSerializer.data = property(timed_data)
+
+
+def route_of(request):
+    match = request.resolver_match
+    return f"{request.method} {match.view_name if match else 'unmatched'}"
+
+
+def record(route, timings):
+    with _metrics_lock:
+        stats = _metrics.setdefault(
+            route,
+            {
+                "count": 0,
+                "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "db_ms": 0.0,
+                "serialize_ms": 0.0,
+                "render_ms": 0.0,
+                "queries": 0,
+                "max_queries": 0,
+            },
+        )
+        stats["count"] += 1
+        stats["buckets"][bisect.bisect_left(LATENCY_BUCKETS_MS, timings["total_ms"])] += 1
+        stats["total_ms"] += timings["total_ms"]
+        stats["max_ms"] = max(stats["max_ms"], timings["total_ms"])
+        stats["db_ms"] += timings["db_ms"]
+        stats["serialize_ms"] += timings["serialize_ms"]
+        stats["render_ms"] += timings["render_ms"]
+        stats["queries"] += timings["queries"]
+        stats["max_queries"] = max(stats["max_queries"], timings["queries"])
+
+
+def request_metrics():
+    labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+    with _metrics_lock:
+        return {
+            route: {
+                "count": stats["count"],
+                "histogram_ms": dict(zip(labels, stats["buckets"])),
+                "avg_ms": round(stats["total_ms"] / stats["count"], 3),
+                "max_ms": round(stats["max_ms"], 3),
+                "avg_db_ms": round(stats["db_ms"] / stats["count"], 3),
+                "avg_serialize_ms": round(stats["serialize_ms"] / stats["count"], 3),
+                "avg_render_ms": round(stats["render_ms"] / stats["count"], 3),
+                "avg_queries": round(stats["queries"] / stats["count"], 2),
+                "max_queries": stats["max_queries"],
+            }
+            for route, stats in _metrics.items()
+        }
+
+
+def reset_request_metrics():
+    with _metrics_lock:
+        _metrics.clear()
+
+
+class RequestInstrumentationMiddleware:
+    """Per-request SQL count, DB time, serialization, render and wall time.
+
+    Serialization is the time spent producing serializer .data (queries it
+    triggers included); render is the renderer turning the result into the
+    response body.
+
+    Enabled with REQUEST_INSTRUMENTATION; results go out as a Server-Timing
+    header, an "instrumentation" log line and the per-route histograms
+    served by the admin request-metrics endpoint.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        instrument_serializers()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._render_ms = 0.0
+        serialization = {"ms": 0.0, "depth": 0}
+        token = _serialization.set(serialization)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timer))
+                response = self.get_response(request)
+        finally:
+            _serialization.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        timings = {
+            "queries": timer.count,
+            "db_ms": round(timer.duration * 1000, 3),
+            "serialize_ms": round(serialization["ms"], 3),
+            "render_ms": round(request._render_ms, 3),
+            "total_ms": round(total_ms, 3),
+        }
+        route = route_of(request)
+        record(route, timings)
+
+        response["Server-Timing"] = (
+            f'db;dur={timings["db_ms"]};desc="{timings["queries"]} queries", '
+            f'serialize;dur={timings["serialize_ms"]}, '
+            f'render;dur={timings["render_ms"]}, '
+            f'total;dur={timings["total_ms"]}'
+        )
+        logger.info(
+            f"route={route!r} status={response.status_code} queries={timings['queries']} "
+            f"db_ms={timings['db_ms']} serialize_ms={timings['serialize_ms']} "
+            f"render_ms={timings['render_ms']} "
+            f"total_ms={timings['total_ms']}",
+            extra={"route": route, "status": response.status_code, **timings},
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered (serialized to JSON) after this hook;
+        # the post-render callback closes the window.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._render_ms += (time.perf_counter() - started) * 1000
+
+        response.add_post_render_callback(rendered)
+        return response
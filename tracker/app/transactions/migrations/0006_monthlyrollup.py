@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model('transactions', 'Transaction')
+    MonthlyRollup = apps.get_model('transactions', 'MonthlyRollup')
+    rows = (
+        Transaction.objects.annotate(month=TruncMonth('date', output_field=DateField()))
+        .values('user_id', 'month', 'transaction_type', 'category_id')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    MonthlyRollup.objects.bulk_create(
+        (MonthlyRollup(**row) for row in rows.iterator()), batch_size=1000
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0005_transaction_transaction_user_id_257a00_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('transaction_type', models.CharField(choices=[('INCOME', 'Income'), ('EXPENSE', 'Expense'), ('SAVINGS', 'Savings')], max_length=10)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='transactions.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['month'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'month', 'transaction_type', 'category'), name='unique_monthly_rollup', nulls_distinct=False)],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:45
+
+from django.db import migrations, models
+
+from transactions.fingerprints import transaction_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # Pre-existing duplicates keep a NULL fingerprint so the unique
+    # constraint can be added without touching their data.
+    Transaction = apps.get_model('transactions', 'Transaction')
+    seen = set()
+    batch = []
+    for t in Transaction.objects.order_by('id').iterator(chunk_size=2000):
+        fingerprint = transaction_fingerprint(
+            t.user_id, t.transaction_type, t.date, t.amount, t.description
+        )
+        if (t.user_id, fingerprint) in seen:
+            continue
+        seen.add((t.user_id, fingerprint))
+        t.fingerprint = fingerprint
+        batch.append(t)
+        if len(batch) == 2000:
+            Transaction.objects.bulk_update(batch, ['fingerprint'])
+            batch = []
+    Transaction.objects.bulk_update(batch, ['fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0006_monthlyrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(fields=('user', 'fingerprint'), name='unique_transaction_fingerprint'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0008_importjob'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['user', '-date', '-id'], name='transaction_user_page_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0009_transaction_user_page_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDataVersion',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('version', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
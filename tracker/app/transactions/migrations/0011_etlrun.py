@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0010_userdataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EtlRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=255)),
+                ('strategy', models.CharField(max_length=20)),
+                ('status', models.CharField(choices=[('COMPLETED', 'Completed'), ('FAILED', 'Failed')], max_length=10)),
+                ('rows', models.PositiveIntegerField(default=0)),
+                ('imported', models.PositiveIntegerField(default=0)),
+                ('duplicates', models.PositiveIntegerField(default=0)),
+                ('dropped', models.PositiveIntegerField(default=0)),
+                ('chunks', models.PositiveIntegerField(default=0)),
+                ('duration_seconds', models.FloatField(default=0)),
+                ('peak_memory_mb', models.FloatField(default=0)),
+                ('stages', models.JSONField(default=dict)),
+                ('error', models.TextField(blank=True, default='')),
+                ('started_at', models.DateTimeField()),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='etl_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:54
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_spent(apps, schema_editor):
+    Transaction = apps.get_model('transactions', 'Transaction')
+    Budget = apps.get_model('transactions', 'Budget')
+    spent = (
+        Transaction.objects.filter(
+            user=OuterRef('user'),
+            category=OuterRef('category'),
+            transaction_type='EXPENSE',
+            date__date__gte=OuterRef('start_date'),
+            date__date__lte=OuterRef('end_date'),
+        )
+        .order_by()
+        .values('user')
+        .annotate(total=Sum('amount'))
+        .values('total')
+    )
+    Budget.objects.update(
+        spent_amount=Coalesce(
+            Subquery(spent),
+            Value(Decimal('0')),
+            output_field=models.DecimalField(max_digits=14, decimal_places=2),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0011_etlrun'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='budget',
+            name='spent_amount',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+        migrations.RunPython(backfill_spent, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:59
+
+import django.contrib.postgres.constraints
+import django.contrib.postgres.fields.ranges
+import transactions.models
+from django.db import migrations, models
+
+
+def check_overlapping_budgets(apps, schema_editor):
+    # Existing overlaps would block the constraint. Which budget should stay
+    # active is the user's call, so stop and name them rather than change
+    # their data here.
+    Budget = apps.get_model('transactions', 'Budget')
+    kept = {}
+    conflicts = []
+    for budget in Budget.objects.filter(is_active=True).order_by('id').iterator():
+        windows = kept.setdefault((budget.user_id, budget.category_id), [])
+        clashes = [
+            other_id
+            for other_id, start, end in windows
+            if start <= budget.end_date and end >= budget.start_date
+        ]
+        if clashes:
+            conflicts.append(f"{budget.id} (overlaps {', '.join(map(str, clashes))})")
+        windows.append((budget.id, budget.start_date, budget.end_date))
+    if conflicts:
+        raise RuntimeError(
+            'Active budgets overlap for the same user and category, which the '
+            'exclusion constraint added by this migration forbids. Deactivate '
+            'or reschedule these budgets, then migrate again: ' + '; '.join(conflicts)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0012_budget_spent_amount'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_overlapping_budgets, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='budget',
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(condition=models.Q(('is_active', True)), expressions=[(transactions.models.BigIntRange('user_id', 'user_id', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_upper=True)), '='), (transactions.models.BigIntRange('category_id', 'category_id', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_upper=True)), '='), (transactions.models.DateRange('start_date', 'end_date', django.contrib.postgres.fields.ranges.RangeBoundary(inclusive_upper=True)), '&&')], name='exclude_overlapping_active_budgets', violation_error_message='An active budget for this category and period already exists.'),
+        ),
+    ]
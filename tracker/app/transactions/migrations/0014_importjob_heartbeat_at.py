@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:15
+
+from django.db import migrations, models
+
+
+def backfill_heartbeats(apps, schema_editor):
+    # Jobs left RUNNING by earlier workers become reclaimable once stale.
+    ImportJob = apps.get_model('transactions', 'ImportJob')
+    ImportJob.objects.filter(status='RUNNING').update(heartbeat_at=models.F('started_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0013_budget_exclude_overlapping'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_heartbeats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 20:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transactions', '0014_importjob_heartbeat_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='etlrun',
+            name='peak_memory_mb',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
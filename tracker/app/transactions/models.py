@@ -1,6 +1,16 @@
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import (
+    BigIntegerRangeField,
+    DateRangeField,
+    RangeBoundary,
+    RangeOperators,
+)
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+from .fingerprints import transaction_fingerprint
 
 
 class User(AbstractUser):
@@ -25,6 +35,10 @@ class Category(models.Model):
         super().save(*args, **kwargs)
 
 
+# The fields a transaction's fingerprint is computed from.
+FINGERPRINT_FIELDS = ("user_id", "transaction_type", "date", "amount", "description")
+
+
 class Transaction(models.Model):
     TRANSACTION_TYPES = [
         ("INCOME", "Income"),
@@ -46,13 +60,50 @@ class Transaction(models.Model):
     )
     description = models.TextField(blank=True, null=True)
     date = models.DateTimeField()
+    fingerprint = models.CharField(max_length=64, null=True, blank=True, editable=False)
 
     class Meta:
         ordering = ["-date"]
         indexes = [
             models.Index(fields=["user", "date", "transaction_type"]),
             models.Index(fields=["user", "category", "transaction_type", "date"]),
+            models.Index(fields=["user", "-date", "-id"], name="transaction_user_page_idx"),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "fingerprint"],
+                name="unique_transaction_fingerprint",
+            )
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if set(FINGERPRINT_FIELDS).issubset(field_names):
+            instance._fingerprint_source = instance.fingerprint_source()
+        return instance
+
+    def fingerprint_source(self):
+        return tuple(getattr(self, name) for name in FINGERPRINT_FIELDS)
+
+    def refresh_fingerprint(self):
+        # A stored row keeps its fingerprint, which may carry an occurrence
+        # number (fingerprints.number_occurrences) or be NULL for duplicates
+        # older than fingerprints, until a field it is made of changes.
+        source = self.fingerprint_source()
+        if source != getattr(self, "_fingerprint_source", None):
+            self.fingerprint = transaction_fingerprint(*source)
+        return source
+
+    def save(self, *args, **kwargs):
+        # Strings and naive datetimes are accepted as by the field itself;
+        # the fingerprint, rollups and budget counters need an aware value.
+        self.date = self._meta.get_field("date").to_python(self.date)
+        if self.date is not None and timezone.is_naive(self.date):
+            self.date = timezone.make_aware(self.date)
+        source = self.refresh_fingerprint()
+        super().save(*args, **kwargs)
+        self._fingerprint_source = source
 
     def clean(self):
         if self.transaction_type == "EXPENSE" and not self.category:
@@ -64,6 +115,22 @@ class Transaction(models.Model):
         return f"{self.user.username} - {self.transaction_type} - {self.amount}"
 
 
+class DateRange(models.Func):
+    function = "DATERANGE"
+    output_field = DateRangeField()
+
+
+class BigIntRange(models.Func):
+    function = "INT8RANGE"
+    output_field = BigIntegerRangeField()
+
+
+def single_value_range(field):
+    # [id, id] ranges compare with = under GiST's built-in range operator
+    # class, so the constraint does not need the btree_gist extension.
+    return BigIntRange(field, field, RangeBoundary(inclusive_upper=True))
+
+
 class Budget(models.Model):
     PERIOD_CHOICES = [
         ("MONTHLY", "Monthly"),
@@ -77,6 +144,9 @@ class Budget(models.Model):
         Category, on_delete=models.CASCADE, related_name="budgets"
     )
     limit_amount = models.DecimalField(max_digits=12, decimal_places=2)
+    # Running total of the category's expenses inside the window, kept up to
+    # date on every transaction write (see transactions.budgets).
+    spent_amount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
     period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
     start_date = models.DateField()
     end_date = models.DateField()
@@ -90,7 +160,22 @@ class Budget(models.Model):
             models.UniqueConstraint(
                 fields=["user", "category", "period", "start_date", "end_date"],
                 name="unique_budget_per_period",
-            )
+            ),
+            # Active budgets of one user and category may not share a day;
+            # the GiST index behind it also serves overlap lookups.
+            ExclusionConstraint(
+                name="exclude_overlapping_active_budgets",
+                expressions=[
+                    (single_value_range("user_id"), RangeOperators.EQUAL),
+                    (single_value_range("category_id"), RangeOperators.EQUAL),
+                    (
+                        DateRange("start_date", "end_date", RangeBoundary(inclusive_upper=True)),
+                        RangeOperators.OVERLAPS,
+                    ),
+                ],
+                condition=models.Q(is_active=True),
+                violation_error_message="An active budget for this category and period already exists.",
+            ),
         ]
 
     def clean(self):
@@ -99,3 +184,125 @@ class Budget(models.Model):
 
     def __str__(self):
         return f"{self.user.username} - {self.category.name} ({self.limit_amount})"
+
+
+class MonthlyRollup(models.Model):
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="monthly_rollups"
+    )
+    month = models.DateField()
+    transaction_type = models.CharField(
+        max_length=10, choices=Transaction.TRANSACTION_TYPES
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="monthly_rollups",
+    )
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["month"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "month", "transaction_type", "category"],
+                name="unique_monthly_rollup",
+                nulls_distinct=False,
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.month:%Y-%m} - {self.transaction_type} ({self.total})"
+
+
+class ImportJob(models.Model):
+    STATUS_CHOICES = [
+        ("PENDING", "Pending"),
+        ("RUNNING", "Running"),
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="import_jobs")
+    file = models.FileField(upload_to="imports/")
+    filename = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PENDING")
+    rows_processed = models.PositiveIntegerField(default=0)
+    rows_imported = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    chunks = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True, default="")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed by the worker after every chunk; see jobs.claim_next_job.
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    @property
+    def rows_per_second(self):
+        if not self.started_at:
+            return 0
+        elapsed = ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
+        return round(self.rows_processed / elapsed, 2) if elapsed > 0 else 0
+
+    def __str__(self):
+        return f"{self.user.username} - {self.filename} ({self.status})"
+
+
+class EtlRun(models.Model):
+    # One row per instrumented ETL run, kept as history for spotting
+    # regressions; stages holds the per-stage report.
+    STATUS_CHOICES = [
+        ("COMPLETED", "Completed"),
+        ("FAILED", "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, related_name="etl_runs"
+    )
+    source = models.CharField(max_length=255)
+    strategy = models.CharField(max_length=20)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    rows = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    dropped = models.PositiveIntegerField(default=0)
+    chunks = models.PositiveIntegerField(default=0)
+    duration_seconds = models.FloatField(default=0)
+    # Only measured when allocations are traced (ETL_TRACE_MEMORY).
+    peak_memory_mb = models.FloatField(null=True, blank=True)
+    stages = models.JSONField(default=dict)
+    error = models.TextField(blank=True, default="")
+
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+
+    @property
+    def rows_per_second(self):
+        return round(self.rows / self.duration_seconds, 2) if self.duration_seconds else 0
+
+    def __str__(self):
+        return f"{self.source} ({self.status}, {self.duration_seconds}s)"
+
+
+class UserDataVersion(models.Model):
+    # Bumped on every write to a user's transactions or budgets; cached
+    # responses are keyed by it. user_id is deliberately not a foreign key
+    # so bumps during a cascading user delete never violate a constraint.
+    user_id = models.BigIntegerField(primary_key=True)
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"user {self.user_id} - v{self.version}"
@@ -0,0 +1,127 @@
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param
+
+
+def keyset_filter(ordering, position):
+    # Rows strictly after position in ordering: a > x, or a = x and b > y, ...
+    condition = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+class TransactionCursorPagination(CursorPagination):
+    # Keyset pagination over (-date, -id), or over the requested ordering
+    # plus id: the cursor holds every sort key of the row it stops at, so
+    # each page is a range scan on the (user, -date, -id) index and rows
+    # sharing a date or an amount are never skipped or repeated. DRF's
+    # cursor only keeps the first key and steps over ties with an OFFSET.
+    ordering = ("-date", "-id")
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if ordering and ordering[-1].lstrip("-") != "id":
+            # Break ties on the requested field (e.g. equal amounts) by id.
+            ordering += ("-id" if ordering[0].startswith("-") else "id",)
+        return ordering
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = self.cursor.position if self.cursor else None
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(
+                keyset_filter(ordering, self.to_python(queryset.model, position))
+            )
+
+        # One extra row tells whether another page follows.
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        self.display_page_controls = self.has_previous or self.has_next
+        return self.page
+
+    def to_python(self, model, position):
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        try:
+            return [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, position)
+            ]
+        except ValidationError:
+            raise NotFound(self.invalid_cursor_message)
+
+    def link(self, reverse, item):
+        # With an empty page, the page's boundary is the cursor itself.
+        position = (
+            self._get_position_from_instance(item, self.ordering)
+            if item is not None
+            else self.cursor.position
+        )
+        return self.encode_cursor(Cursor(offset=0, reverse=reverse, position=position))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.link(False, self.page[-1] if self.page else None)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.link(True, self.page[0] if self.page else None)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return Cursor(offset=0, reverse=reverse, position=tokens.get("p"))
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": cursor.position}
+        if cursor.reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _get_position_from_instance(self, instance, ordering):
+        names = [field.lstrip("-") for field in ordering]
+        if isinstance(instance, dict):
+            return [str(instance[name]) for name in names]
+        return [str(getattr(instance, name)) for name in names]
@@ -0,0 +1,136 @@
+from collections import defaultdict
+from decimal import Decimal
+
+import pandas as pd
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import MonthlyRollup, Transaction
+
+
+def month_of(value):
+    return timezone.localtime(value).date().replace(day=1)
+
+
+def rollup_key(user_id, date, transaction_type, category_id):
+    return (user_id, month_of(date), transaction_type, category_id)
+
+
+def collect_deltas(rows, sign=1, deltas=None):
+    # rows: iterables of (user_id, date, transaction_type, category_id, amount)
+    deltas = deltas if deltas is not None else defaultdict(lambda: [Decimal(0), 0])
+    for user_id, date, transaction_type, category_id, amount in rows:
+        delta = deltas[rollup_key(user_id, date, transaction_type, category_id)]
+        delta[0] += sign * Decimal(str(amount))
+        delta[1] += sign
+    return deltas
+
+
+def apply_deltas(deltas):
+    for (user_id, month, transaction_type, category_id), (amount, count) in deltas.items():
+        if not amount and not count:
+            continue
+
+        lookup = {
+            "user_id": user_id,
+            "month": month,
+            "transaction_type": transaction_type,
+            "category_id": category_id,
+        }
+        rollups = MonthlyRollup.objects.filter(**lookup)
+        changes = {"total": F("total") + amount, "count": F("count") + count}
+
+        if rollups.update(**changes):
+            if count < 0:
+                rollups.filter(count__lte=0).delete()
+            continue
+
+        # Decrements never create rows: the rollup may already be gone
+        # through a cascading delete of its user or category.
+        if count <= 0:
+            continue
+        try:
+            with transaction.atomic():
+                MonthlyRollup.objects.create(**lookup, total=amount, count=count)
+        except IntegrityError:
+            rollups.update(**changes)
+
+
+ROW_FIELDS = ("user_id", "date", "transaction_type", "category_id", "amount")
+
+
+def transaction_row(obj):
+    return (obj.user_id, obj.date, obj.transaction_type, obj.category_id, obj.amount)
+
+
+def record_transactions(transactions, sign=1):
+    apply_deltas(collect_deltas((transaction_row(t) for t in transactions), sign))
+
+
+def record_frame(frame):
+    # Vectorized counterpart of record_transactions for loaded DataFrames
+    # (user_id, date, transaction_type, category_id, amount columns).
+    if frame.empty:
+        return
+
+    dates = frame["date"].dt.tz_convert(timezone.get_current_timezone())
+    grouped = (
+        pd.DataFrame(
+            {
+                "user_id": frame["user_id"],
+                "month": dates.dt.tz_localize(None).dt.to_period("M").dt.start_time.dt.date,
+                "transaction_type": frame["transaction_type"],
+                "category_id": frame["category_id"],
+                "cents": (frame["amount"].astype(float) * 100).round().astype("int64"),
+            }
+        )
+        .groupby(
+            ["user_id", "month", "transaction_type", "category_id"], dropna=False
+        )["cents"]
+        .agg(["sum", "count"])
+    )
+
+    apply_deltas(
+        {
+            (
+                int(user_id),
+                month,
+                transaction_type,
+                None if pd.isna(category_id) else int(category_id),
+            ): (Decimal(int(cents)) / 100, int(count))
+            for (user_id, month, transaction_type, category_id), cents, count in zip(
+                grouped.index, grouped["sum"], grouped["count"]
+            )
+        }
+    )
+
+
+def record_change(previous, current):
+    deltas = collect_deltas([transaction_row(current)])
+    if previous is not None:
+        collect_deltas([previous], sign=-1, deltas=deltas)
+    apply_deltas(deltas)
+
+
+def rebuild_monthly_rollups(users=None):
+    transactions = Transaction.objects.all()
+    rollups = MonthlyRollup.objects.all()
+    if users is not None:
+        transactions = transactions.filter(user__in=users)
+        rollups = rollups.filter(user__in=users)
+
+    rows = (
+        transactions.annotate(month=TruncMonth("date", output_field=DateField()))
+        .values("user_id", "month", "transaction_type", "category_id")
+        .annotate(total=Sum("amount"), count=Count("id"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        rollups.delete()
+        created = MonthlyRollup.objects.bulk_create(
+            (MonthlyRollup(**row) for row in rows.iterator()), batch_size=1000
+        )
+    return len(created)
@@ -1,9 +1,13 @@
 from rest_framework import serializers
-from .models import Transaction, Category, Budget
-from django.db.models import Sum
+from .models import Transaction, Category, Budget, ImportJob
+from .budgets import percentage_used, remaining_amount
+from .categories import get_category_id, normalize_category_name, with_fresh_categories
+from .db_errors import constraint_name, is_duplicate_transaction
+from django.db import IntegrityError, transaction
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
+BUDGET_OVERLAP_CONSTRAINT = "exclude_overlapping_active_budgets"
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -26,6 +30,14 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = ["id", "name"]
 
 
+def category_error(transaction_type, category):
+    if transaction_type == "EXPENSE" and not category:
+        return "Expense transactions must have a category."
+    if transaction_type != "EXPENSE" and category:
+        return "Only expense transactions can have a category."
+    return None
+
+
 class TransactionSerializer(serializers.ModelSerializer):
     category = serializers.CharField(required=False, allow_blank=True)
 
@@ -41,31 +53,53 @@ class TransactionSerializer(serializers.ModelSerializer):
         ]
 
     def validate(self, data):
-        transaction_type = data.get("transaction_type")
-        category = data.get("category")
+        error = category_error(data.get("transaction_type"), data.get("category"))
+        if error:
+            raise serializers.ValidationError(error)
+        return data
 
-        if transaction_type == "EXPENSE" and not category:
-            raise serializers.ValidationError(
-                "Expense transactions must have a category."
-            )
+    def create(self, validated_data):
+        category_name = validated_data.pop("category", None)
 
-        if transaction_type != "EXPENSE" and category:
-            raise serializers.ValidationError(
-                "Only expense transactions can have a category."
-            )
+        def create():
+            category_obj = None
+            if category_name:
+                # Built from the category cache so neither the lookup nor the
+                # response needs to touch the category table.
+                category_obj = Category(
+                    id=get_category_id(category_name),
+                    name=normalize_category_name(category_name),
+                )
+            with transaction.atomic():
+                return Transaction.objects.create(category=category_obj, **validated_data)
+
+        try:
+            return with_fresh_categories(create)
+        except IntegrityError as e:
+            if not is_duplicate_transaction(e):
+                raise
+            raise serializers.ValidationError("This transaction already exists.")
+
+
+class TransactionBulkUpdateSerializer(TransactionSerializer):
+    id = serializers.IntegerField()
+
+    class Meta(TransactionSerializer.Meta):
+        pass
 
+    def validate(self, data):
+        # Type/category consistency depends on the stored row, so it is
+        # checked once the batch is loaded (see bulk_update_transactions).
         return data
 
-    def create(self, validated_data):
-        category_name = validated_data.pop("category", None)
 
-        category_obj = None
-        if category_name:
-            category_obj, _ = Category.objects.get_or_create(
-                name=category_name.strip().title()
-            )
+class TransactionBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
 
-        return Transaction.objects.create(category=category_obj, **validated_data)
+
+class BulkResultSerializer(serializers.Serializer):
+    id = serializers.IntegerField(allow_null=True)
+    status = serializers.CharField()
 
 
 class BudgetSerializer(serializers.ModelSerializer):
@@ -84,32 +118,34 @@ class BudgetSerializer(serializers.ModelSerializer):
         ]
 
     def validate(self, attrs):
-        user = self.context["request"].user
-        category_name = attrs["category"].strip().title()
-        category_obj, _ = Category.objects.get_or_create(name=category_name)
-
-        qs = Budget.objects.filter(
-            user=user,
-            category=category_obj,
-            start_date__lte=attrs["end_date"],
-            end_date__gte=attrs["start_date"],
-            is_active=True,
-        )
-        if self.instance:
-            qs = qs.exclude(id=self.instance.id)
+        start_date = attrs.get("start_date", getattr(self.instance, "start_date", None))
+        end_date = attrs.get("end_date", getattr(self.instance, "end_date", None))
+        if start_date >= end_date:
+            raise serializers.ValidationError("End date must be after start date.")
+        if "category" in attrs:
+            attrs["category_id"] = get_category_id(attrs.pop("category"))
+        return attrs
 
-        if qs.exists():
+    def save_budget(self, save):
+        # Overlapping active budgets are rejected by the database's exclusion
+        # constraint, which also holds for concurrent requests.
+        try:
+            with transaction.atomic():
+                return save()
+        except IntegrityError as e:
+            if constraint_name(e) != BUDGET_OVERLAP_CONSTRAINT:
+                raise
             raise serializers.ValidationError(
                 "An active budget for this category and period already exists."
             )
 
-        attrs["category"] = category_obj
-        return attrs
-
     def create(self, validated_data):
         user = self.context["request"].user
-        category_obj = validated_data.pop("category")
-        return Budget.objects.create(user=user, category=category_obj, **validated_data)
+        return self.save_budget(lambda: Budget.objects.create(user=user, **validated_data))
+
+    def update(self, instance, validated_data):
+        parent = super()
+        return self.save_budget(lambda: parent.update(instance, validated_data))
 
 
 class BudgetReadSerializer(serializers.ModelSerializer):
@@ -135,29 +171,43 @@ class BudgetReadSerializer(serializers.ModelSerializer):
         ]
 
     def get_spent_amount(self, obj):
-        if not hasattr(obj, "_spent_cache"):
-            obj._spent_cache = (
-                Transaction.objects.filter(
-                    user=obj.user,
-                    category=obj.category,
-                    transaction_type="EXPENSE",
-                    date__range=[obj.start_date, obj.end_date],
-                ).aggregate(total=Sum("amount"))["total"]
-                or 0
-            )
-        return obj._spent_cache
+        return obj.spent_amount
 
     def get_remaining_amount(self, obj):
-        return obj.limit_amount - self.get_spent_amount(obj)
+        return remaining_amount(obj)
 
     def get_percentage_used(self, obj):
-        spent = self.get_spent_amount(obj)
-        return round((spent / obj.limit_amount) * 100, 2) if obj.limit_amount > 0 else 0
+        return percentage_used(self.get_spent_amount(obj), obj.limit_amount)
+
+
+class BudgetAlertSerializer(serializers.ModelSerializer):
+    category = serializers.CharField(source="category.name")
+    percentage_used = serializers.SerializerMethodField()
+    threshold = serializers.IntegerField()
+
+    class Meta:
+        model = Budget
+        fields = [
+            "id",
+            "category",
+            "period",
+            "start_date",
+            "end_date",
+            "limit_amount",
+            "spent_amount",
+            "percentage_used",
+            "threshold",
+        ]
+
+    def get_percentage_used(self, obj):
+        return percentage_used(obj.spent_amount, obj.limit_amount)
 
 
 class BudgetDashboardSerializer(serializers.Serializer):
     category = serializers.CharField()
     limit_amount = serializers.FloatField()
+    spent_amount = serializers.FloatField()
+    percentage_used = serializers.FloatField()
 
 
 class PeriodDashboardSerializer(serializers.Serializer):
@@ -171,6 +221,10 @@ class KPISerializer(serializers.Serializer):
     total_expense = serializers.FloatField()
     net_savings = serializers.FloatField()
     budget_used_percentage = serializers.FloatField()
+    monthly_budget_used = serializers.FloatField()
+    yearly_budget_used = serializers.FloatField()
+    weekly_budget_used = serializers.FloatField()
+    custom_budget_used = serializers.FloatField()
 
 
 class DashboardSerializer(serializers.Serializer):
@@ -179,8 +233,32 @@ class DashboardSerializer(serializers.Serializer):
     yearly = PeriodDashboardSerializer()
 
 
+class ImportJobSerializer(serializers.ModelSerializer):
+    rows_per_second = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = ImportJob
+        fields = [
+            "id",
+            "filename",
+            "status",
+            "rows_processed",
+            "rows_imported",
+            "duplicates",
+            "chunks",
+            "error",
+            "rows_per_second",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
 class UploadFileResponseSerializer(serializers.Serializer):
     message = serializers.CharField()
+    job_id = serializers.IntegerField()
+    status = serializers.CharField()
 
 
 class LoginRequestSerializer(serializers.Serializer):
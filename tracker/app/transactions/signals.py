@@ -0,0 +1,126 @@
+from django.db import transaction
+from django.db.models.signals import (
+    pre_save,
+    post_save,
+    post_delete,
+    pre_delete,
+    post_migrate,
+)
+from django.dispatch import receiver
+
+from .models import User, Transaction, Category, Budget, MonthlyRollup, UserDataVersion
+from .authentication import forget_user_state, user_state_cache
+from .cache import bump_category_data_versions, bump_data_version
+from .categories import category_cache
+from . import budgets, rollups
+
+
+@receiver(pre_save, sender=Transaction)
+def remember_previous_transaction(sender, instance, raw, **kwargs):
+    instance._rollup_previous = None
+    if instance.pk and not raw:
+        instance._rollup_previous = (
+            Transaction.objects.filter(pk=instance.pk)
+            .values_list(*rollups.ROW_FIELDS)
+            .first()
+        )
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollups_on_save(sender, instance, raw, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, "_rollup_previous", None)
+    rollups.record_change(previous, instance)
+    budgets.record_spent([rollups.transaction_row(instance)], [previous] if previous else [])
+    bump_data_version(instance.user_id)
+    if previous is not None and previous[0] != instance.user_id:
+        bump_data_version(previous[0])
+
+
+def deleted_with_user(origin):
+    # The user's rollups and budgets are deleted in the same cascade and the
+    # data version right after it (delete_data_version_with_user), so
+    # per-row bookkeeping would only cost queries.
+    return isinstance(origin, User) or getattr(origin, "model", None) is User
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollups_on_delete(sender, instance, origin=None, **kwargs):
+    if getattr(instance, "_rollup_recorded", False) or deleted_with_user(origin):
+        return
+    rollups.record_transactions([instance], sign=-1)
+    budgets.record_spent([], [rollups.transaction_row(instance)])
+    bump_data_version(instance.user_id)
+
+
+@receiver(pre_save, sender=Budget)
+def count_spent_on_budget_change(sender, instance, raw, **kwargs):
+    # A new window starts its counter from the transactions already in it.
+    if raw:
+        return
+    window = (instance.user_id, instance.category_id, instance.start_date, instance.end_date)
+    if instance.pk and window == (
+        Budget.objects.filter(pk=instance.pk)
+        .values_list("user_id", "category_id", "start_date", "end_date")
+        .first()
+    ):
+        return
+    budgets.evaluate_budgets([instance])
+
+
+@receiver(post_save, sender=Budget)
+@receiver(post_delete, sender=Budget)
+def bump_version_on_budget_change(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw and not deleted_with_user(origin):
+        bump_data_version(instance.user_id)
+
+
+@receiver(pre_delete, sender=Category)
+def rebuild_rollups_on_category_delete(sender, instance, **kwargs):
+    # Transactions fall back to no category while their rollups cascade away,
+    # so recompute the affected users once the delete has committed.
+    users = list(
+        MonthlyRollup.objects.filter(category=instance)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    if users:
+        transaction.on_commit(lambda: rollups.rebuild_monthly_rollups(users))
+
+
+@receiver(post_save, sender=Category)
+def cache_category_on_save(sender, instance, raw, created, **kwargs):
+    category_cache.store(instance.name, instance.id)
+    if not raw and not created:
+        bump_category_data_versions(instance.id)
+
+
+@receiver(pre_delete, sender=Category)
+def bump_versions_on_category_delete(sender, instance, **kwargs):
+    # Runs before SET_NULL detaches the transactions, which skips signals.
+    bump_category_data_versions(instance.id)
+
+
+@receiver(post_delete, sender=Category)
+def forget_category_on_delete(sender, instance, **kwargs):
+    category_cache.forget(instance.id)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user_state_on_change(sender, instance, **kwargs):
+    forget_user_state(instance.id)
+
+
+@receiver(post_delete, sender=User)
+def delete_data_version_with_user(sender, instance, **kwargs):
+    # UserDataVersion.user_id is not a foreign key, so the cascade skips it.
+    UserDataVersion.objects.filter(user_id=instance.id).delete()
+
+
+@receiver(post_migrate)
+def clear_category_cache_on_migrate(sender, **kwargs):
+    # migrate and flush can rewrite the tables wholesale.
+    category_cache.clear()
+    user_state_cache.clear()
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from transactions.models import Transaction, Category, Budget
+
+User = get_user_model()
+
+
+class AsyncViewTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="asyncuser", password="asyncpass")
+        food = Category.objects.create(name="Food")
+        travel = Category.objects.create(name="Travel")
+        now = timezone.now()
+        for days, amount, category in [(0, 40, food), (40, 75, travel), (400, 20, food)]:
+            Transaction.objects.create(
+                user=self.user,
+                transaction_type="EXPENSE",
+                amount=amount,
+                category=category,
+                date=now - timedelta(days=days),
+            )
+        Transaction.objects.create(
+            user=self.user, transaction_type="INCOME", amount=1000, date=now
+        )
+        for category, period in [(food, "MONTHLY"), (travel, "YEARLY")]:
+            Budget.objects.create(
+                user=self.user,
+                category=category,
+                limit_amount=500,
+                period=period,
+                start_date=(now - timedelta(days=60)).date(),
+                end_date=(now + timedelta(days=30)).date(),
+            )
+
+        response = self.client.post(
+            reverse("login"),
+            {"username": "asyncuser", "password": "asyncpass"},
+            format="json",
+        )
+        self.token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def assertMatchesSync(self, sync_name, async_name, params=None):
+        sync_response = self.client.get(reverse(sync_name), params)
+        cache.clear()
+        async_response = self.client.get(reverse(async_name), params)
+
+        self.assertEqual(async_response.status_code, 200)
+        self.assertEqual(async_response.json(), sync_response.json())
+
+    def test_dashboard_matches_sync(self):
+        self.assertMatchesSync("transaction-dashboard", "async_dashboard")
+
+    def test_monthly_expense_matches_sync(self):
+        self.assertMatchesSync("monthly_expense", "async_monthly_expense")
+
+    def test_budget_list_matches_sync(self):
+        self.assertMatchesSync("budget-list", "async_budget_list")
+        self.assertMatchesSync(
+            "budget-list",
+            "async_budget_list",
+            {"period": "YEARLY", "ordering": "limit_amount"},
+        )
+
+    def test_requires_valid_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Bearer not-a-token")
+
+        self.assertEqual(self.client.get(reverse("async_dashboard")).status_code, 401)
+        self.client.credentials()
+        self.assertEqual(self.client.get(reverse("async_budget_list")).status_code, 401)
+
+    async def test_runs_on_async_client(self):
+        response = await self.async_client.get(
+            reverse("async_monthly_expense"),
+            headers={"Authorization": f"Bearer {self.token}"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sum(response.json().values()), 135.0)
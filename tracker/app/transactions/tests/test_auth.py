@@ -2,6 +2,8 @@ from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.tokens import AccessToken
+from transactions.authentication import user_state_cache
 
 User = get_user_model()
 
@@ -22,3 +24,62 @@ class AuthTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("access", response.data)
         self.assertIn("refresh", response.data)
+
+
+class StatelessJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        user_state_cache.clear()
+        self.addCleanup(user_state_cache.clear)
+        self.user = User.objects.create_user(username="jwtuser", password="jwtpass")
+        self.login()
+
+    def login(self):
+        response = self.client.post(
+            reverse("login"), {"username": "jwtuser", "password": "jwtpass"}, format="json"
+        )
+        self.token = response.data["access"]
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_token_carries_role(self):
+        self.assertEqual(AccessToken(self.token)["role"], "user")
+
+    def test_cached_state_skips_user_query(self):
+        url = reverse("category-list")
+        with self.assertNumQueries(2):
+            self.client.get(url)
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_token_user_owns_created_rows(self):
+        response = self.client.post(
+            reverse("transaction-list"),
+            {"transaction_type": "INCOME", "amount": "10.00", "date": "2024-01-01T12:00:00Z"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.user.transactions.count(), 1)
+
+    def test_deactivated_user_is_revoked(self):
+        self.client.get(reverse("category-list"))
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.get(reverse("category-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_role_change_revokes_old_tokens(self):
+        self.user.role = "admin"
+        self.user.save()
+
+        self.assertEqual(
+            self.client.get(reverse("category-list")).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.login()
+        self.assertEqual(
+            self.client.get(reverse("request_metrics")).status_code, status.HTTP_200_OK
+        )
@@ -0,0 +1,24 @@
+from django.test import TestCase
+from scripts.benchmark_api import compare, run_suite
+
+
+class BenchmarkSuiteTests(TestCase):
+    def test_suite_runs_and_compares(self):
+        results = run_suite(
+            users=2, transactions_per_user=20, repeat=2, upload_rows=10
+        )
+
+        self.assertEqual(
+            set(results),
+            {"dashboard", "budget_list", "transaction_list", "upload", "etl"},
+        )
+        self.assertEqual(results["etl"]["throughput_unit"], "rows/s")
+        self.assertEqual(compare(results, results), [])
+
+        slower = {
+            "dashboard": {
+                "latency_ms": {"median": results["dashboard"]["latency_ms"]["median"] * 2},
+                "queries": results["dashboard"]["queries"] + 1,
+            }
+        }
+        self.assertEqual(len(compare(slower, results)), 2)
@@ -1,9 +1,19 @@
+import io
+
+import pandas as pd
+from django.core.management import call_command
 from django.utils import timezone
-from datetime import timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from transactions.models import Budget, Category
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from transactions.budgets import evaluate_budgets
+from transactions.etl.load import load_transactions
+from transactions.etl.transform import transform_transaction
+from transactions.models import Budget, Category, Transaction
 
 User = get_user_model()
 
@@ -62,3 +72,284 @@ class BudgetTests(BaseBudgetTestCase):
         response = self.client.post(reverse("budget-list"), data, format="json")
         self.assertEqual(response.status_code, 400)
         self.assertIn("active budget for this category", str(response.data))
+
+    def test_database_rejects_overlapping_active_budgets(self):
+        first = {"start_date": date(2024, 1, 1), "end_date": date(2024, 1, 31)}
+        Budget.objects.create(
+            user=self.user, category=self.category_food, limit_amount=100, period="MONTHLY", **first
+        )
+        # Windows include their end date, so sharing a single day overlaps.
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Budget.objects.create(
+                user=self.user,
+                category=self.category_food,
+                limit_amount=100,
+                period="WEEKLY",
+                start_date=date(2024, 1, 31),
+                end_date=date(2024, 2, 6),
+            )
+
+        for start, end, is_active in [
+            (date(2024, 2, 1), date(2024, 2, 29), True),
+            (date(2024, 1, 10), date(2024, 1, 20), False),
+        ]:
+            Budget.objects.create(
+                user=self.user,
+                category=self.category_food,
+                limit_amount=100,
+                period="CUSTOM",
+                start_date=start,
+                end_date=end,
+                is_active=is_active,
+            )
+        self.assertEqual(Budget.objects.count(), 3)
+
+    def test_update_into_overlap_and_reversed_dates_fail(self):
+        data = {
+            "category": "Food",
+            "limit_amount": 100,
+            "period": "MONTHLY",
+            "start_date": date(2024, 1, 1),
+            "end_date": date(2024, 1, 31),
+        }
+        self.client.post(reverse("budget-list"), data, format="json")
+        data.update(start_date=date(2024, 2, 1), end_date=date(2024, 2, 29))
+        second = self.client.post(reverse("budget-list"), data, format="json").data["id"]
+
+        url = reverse("budget-detail", args=[second])
+        response = self.client.patch(url, {"start_date": date(2024, 1, 15)}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("active budget for this category", str(response.data))
+
+        response = self.client.patch(url, {"end_date": date(2024, 1, 20)}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("End date must be after start date", str(response.data))
+
+
+class BudgetListTests(BaseBudgetTestCase):
+    def create_budgets(self, count, offset=0):
+        today = timezone.now().date()
+        Budget.objects.bulk_create(
+            Budget(
+                user=self.user,
+                category=self.category_food,
+                limit_amount=100,
+                period="CUSTOM",
+                start_date=today - timedelta(days=offset + i + 1),
+                end_date=today + timedelta(days=1),
+                # Only one active budget per category may cover a day.
+                is_active=offset + i == 0,
+            )
+            for i in range(count)
+        )
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("budget-list"))
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries)
+
+    def test_list_query_count_is_constant(self):
+        self.create_budgets(2)
+        self.list_queries()  # caches the JWT user state
+        baseline = self.list_queries()
+
+        self.create_budgets(40, offset=2)
+
+        self.assertEqual(self.list_queries(), baseline)
+
+    def test_list_spent_amount(self):
+        self.create_budgets(1)
+        Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=25,
+            category=self.category_food,
+            date=timezone.now() - timedelta(hours=1),
+        )
+
+        response = self.client.get(reverse("budget-list"))
+        budget = response.data[0]
+
+        self.assertEqual(budget["spent_amount"], 25)
+        self.assertEqual(budget["remaining_amount"], 75)
+        self.assertEqual(budget["percentage_used"], 25)
+
+
+class BudgetEvaluationTests(BaseBudgetTestCase):
+    def expense(self, amount, when, category=None, user=None):
+        Transaction.objects.create(
+            user=user or self.user,
+            transaction_type="EXPENSE",
+            amount=amount,
+            category=category or self.category_food,
+            date=when,
+        )
+
+    def budget(self, period, start, end, limit=100):
+        return Budget.objects.create(
+            user=self.user,
+            category=self.category_food,
+            limit_amount=limit,
+            period=period,
+            start_date=start,
+            end_date=end,
+            is_active=period != "MONTHLY",
+        )
+
+    def test_spent_per_window_for_every_period(self):
+        day = datetime(2024, 3, 10, 12, tzinfo=dt_timezone.utc)
+        weekly = self.budget("WEEKLY", date(2024, 3, 4), date(2024, 3, 10))
+        custom = self.budget("CUSTOM", date(2024, 3, 11), date(2024, 3, 20), limit=40)
+        monthly = self.budget("MONTHLY", date(2024, 3, 1), date(2024, 3, 31))
+        yearly = self.budget("YEARLY", date(2023, 1, 1), date(2023, 12, 31))
+        self.expense("10.25", day)
+        self.expense(5, day + timedelta(hours=11, minutes=59))  # last second of the window
+        self.expense(30, day + timedelta(days=1))
+        self.expense(99, day, category=Category.objects.create(name="Travel"))
+        other = User.objects.create_user(username="other", password="otherpass")
+        self.expense(99, day, user=other)
+
+        spent = {
+            b.id: b.spent_amount
+            for b in evaluate_budgets(Budget.objects.order_by("id"))
+        }
+
+        self.assertEqual(spent[weekly.id], Decimal("15.25"))
+        self.assertEqual(spent[custom.id], Decimal("30.00"))
+        self.assertEqual(spent[monthly.id], Decimal("45.25"))
+        self.assertEqual(spent[yearly.id], 0)
+
+        kpis = self.client.get(reverse("transaction-dashboard")).data["kpis"]
+        self.assertEqual(kpis["weekly_budget_used"], 15.25)
+        self.assertEqual(kpis["custom_budget_used"], 75.0)
+        self.assertEqual(kpis["yearly_budget_used"], 0)
+        self.assertEqual(kpis["budget_used_percentage"], 18.85)
+
+    def test_retrieve_evaluates_single_budget(self):
+        today = timezone.now().date()
+        budget = self.budget("WEEKLY", today - timedelta(days=3), today + timedelta(days=3))
+        self.expense(20, timezone.now())
+
+        response = self.client.get(reverse("budget-detail", args=[budget.id]))
+
+        self.assertEqual(response.data["spent_amount"], 20)
+        self.assertEqual(response.data["remaining_amount"], 80)
+        self.assertEqual(response.data["percentage_used"], 20)
+
+
+class BudgetCounterTests(BaseBudgetTestCase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.now().date()
+        self.budget = Budget.objects.create(
+            user=self.user,
+            category=self.category_food,
+            limit_amount=100,
+            period="MONTHLY",
+            start_date=self.today - timedelta(days=10),
+            end_date=self.today + timedelta(days=10),
+        )
+
+    def spent(self):
+        self.budget.refresh_from_db()
+        return self.budget.spent_amount
+
+    def expense(self, amount, days_ago=0, **extra):
+        return Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=amount,
+            category=self.category_food,
+            date=timezone.now() - timedelta(days=days_ago),
+            **extra,
+        )
+
+    def test_counter_follows_edits_and_deletes(self):
+        self.expense(50, days_ago=30)
+        food = self.expense(20)
+        self.assertEqual(self.spent(), 20)
+
+        food.amount = 35
+        food.save()
+        self.assertEqual(self.spent(), 35)
+
+        food.date = timezone.now() - timedelta(days=30)
+        food.save()
+        self.assertEqual(self.spent(), 0)
+
+        food.date = timezone.now()
+        food.category = Category.objects.create(name="Travel")
+        food.save()
+        self.assertEqual(self.spent(), 0)
+
+        food.category = self.category_food
+        food.save()
+        food.delete()
+        self.assertEqual(self.spent(), 0)
+
+    def test_new_budget_counts_existing_expenses(self):
+        self.expense(15, days_ago=20)
+        self.budget.start_date = self.today - timedelta(days=25)
+        self.budget.save()
+
+        self.assertEqual(self.spent(), 15)
+
+    def test_bulk_and_import_paths(self):
+        url = reverse("transaction-bulk")
+        items = [
+            {"transaction_type": "EXPENSE", "amount": "30.00", "category": "Food",
+             "date": timezone.now().isoformat(), "description": f"bulk {i}"}
+            for i in range(2)
+        ]
+        ids = [row["id"] for row in self.client.post(url, items, format="json").data]
+        self.assertEqual(self.spent(), 60)
+
+        self.client.patch(url, [{"id": ids[0], "amount": "10.00"}], format="json")
+        self.assertEqual(self.spent(), 40)
+
+        self.client.delete(url, {"ids": ids}, format="json")
+        self.assertEqual(self.spent(), 0)
+
+        frame = pd.DataFrame(
+            {
+                "date": [timezone.now().strftime("%Y-%m-%d %H:%M:%S")] * 2,
+                "amount": [-12.5, 100],
+                "category": ["Food", "Salary"],
+                "description": ["Groceries", "Pay"],
+            }
+        )
+        load_transactions(transform_transaction(frame), self.user)
+        self.assertEqual(self.spent(), Decimal("12.50"))
+
+    def test_alerts_read_counters(self):
+        self.expense(85)
+        Budget.objects.create(
+            user=self.user,
+            category=Category.objects.create(name="Travel"),
+            limit_amount=50,
+            period="WEEKLY",
+            start_date=self.today,
+            end_date=self.today + timedelta(days=6),
+        )
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("budget-alerts"))
+        self.assertEqual(
+            [(a["category"], a["threshold"]) for a in response.data], [("Food", 80)]
+        )
+
+        self.expense(20)
+        response = self.client.get(reverse("budget-alerts"))
+        self.assertEqual(response.data[0]["threshold"], 100)
+        self.assertEqual(response.data[0]["percentage_used"], 105)
+
+    def test_reconcile_command(self):
+        self.expense(40)
+        Budget.objects.update(spent_amount=999)
+        out = io.StringIO()
+
+        call_command("reconcile_budgets", stdout=out)
+
+        self.assertEqual(self.spent(), 40)
+        self.assertIn("corrected 1", out.getvalue())
@@ -0,0 +1,138 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from transactions.models import Transaction, Category, MonthlyRollup
+
+User = get_user_model()
+
+
+class BulkTransactionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulkuser", password="bulkpass")
+        self.category_food = Category.objects.create(name="Food")
+        self.url = reverse("transaction-bulk")
+
+        response = self.client.post(
+            reverse("login"),
+            {"username": "bulkuser", "password": "bulkpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def items(self, count):
+        now = timezone.now().replace(day=15, hour=12)
+        return [
+            {
+                "transaction_type": "EXPENSE",
+                "amount": 10 + i,
+                "category": "food" if i % 2 else "Books",
+                "description": f"Item {i}",
+                "date": (now - timedelta(minutes=i)).isoformat(),
+            }
+            for i in range(count)
+        ]
+
+    def rollups(self):
+        return sorted(
+            MonthlyRollup.objects.values_list(
+                "month", "transaction_type", "category_id", "total", "count"
+            )
+        )
+
+    def assertRollupsMatchRebuild(self):
+        incremental = self.rollups()
+        call_command("rebuild_rollups", stdout=io.StringIO())
+        self.assertEqual(incremental, self.rollups())
+
+    def test_bulk_create(self):
+        items = self.items(20)
+        items.append(dict(items[0]))
+
+        with self.assertNumQueries(18):
+            response = self.client.post(self.url, items, format="json")
+
+        # An item repeated within the batch is a second, identical purchase.
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([r["status"] for r in response.data], ["created"] * 21)
+        self.assertNotEqual(response.data[-1]["id"], response.data[0]["id"])
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 21)
+        self.assertEqual(
+            Transaction.objects.filter(category=self.category_food).count(), 10
+        )
+        self.assertRollupsMatchRebuild()
+
+        retried = self.client.post(self.url, items, format="json")
+        self.assertEqual([r["status"] for r in retried.data], ["duplicate"] * 21)
+        self.assertEqual(
+            [r["id"] for r in retried.data], [r["id"] for r in response.data]
+        )
+
+    def test_bulk_create_is_all_or_nothing(self):
+        items = self.items(3)
+        items[1]["category"] = ""
+
+        response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), [1])
+        self.assertIn("non_field_errors", response.data[1])
+        self.assertEqual(Transaction.objects.count(), 0)
+
+    def test_bulk_update(self):
+        created = self.client.post(self.url, self.items(3), format="json").data
+        other = User.objects.create_user(username="other", password="otherpass")
+        foreign = Transaction.objects.create(
+            user=other, transaction_type="INCOME", amount=5, date=timezone.now()
+        )
+
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": created[0]["id"], "amount": "99.50", "category": "Travel"},
+                {"id": created[1]["id"], "description": "Renamed"},
+                {"id": foreign.id, "amount": 1},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["status"] for r in response.data], ["updated", "updated", "not_found"]
+        )
+        first = Transaction.objects.get(id=created[0]["id"])
+        self.assertEqual(
+            (first.amount, first.category.name), (Decimal("99.50"), "Travel")
+        )
+        self.assertEqual(
+            Transaction.objects.get(id=created[1]["id"]).description, "Renamed"
+        )
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.amount, 5)
+        self.assertRollupsMatchRebuild()
+
+    def test_bulk_delete(self):
+        created = self.client.post(self.url, self.items(4), format="json").data
+        ids = [created[0]["id"], created[1]["id"], 0]
+
+        response = self.client.delete(self.url, {"ids": ids}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r["status"] for r in response.data], ["deleted", "deleted", "not_found"]
+        )
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.assertRollupsMatchRebuild()
+
+    @override_settings(TRANSACTION_BULK_MAX_ITEMS=2)
+    def test_batch_size_limit(self):
+        response = self.client.post(self.url, self.items(3), format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Transaction.objects.count(), 0)
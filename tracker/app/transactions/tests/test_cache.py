@@ -0,0 +1,111 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from datetime import timedelta
+import pandas as pd
+from transactions.models import Transaction, Category, Budget
+from transactions.etl.load import load_transactions
+from transactions.etl.transform import transform_transaction
+from transactions.cache import reset_cache_metrics
+
+User = get_user_model()
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        reset_cache_metrics()
+        self.user = User.objects.create_user(username="cacheuser", password="cachepass")
+        self.category_food = Category.objects.create(name="Food")
+        self.login("cacheuser", "cachepass")
+
+    def login(self, username, password):
+        response = self.client.post(
+            reverse("login"), {"username": username, "password": password}, format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def add_expense(self, amount):
+        return Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=amount,
+            category=self.category_food,
+            date=timezone.now(),
+        )
+
+    def total_expense(self):
+        return self.client.get(reverse("transaction-dashboard")).data["kpis"]["total_expense"]
+
+    def test_repeated_dashboard_is_served_from_cache(self):
+        self.add_expense(10)
+        self.client.get(reverse("transaction-dashboard"))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("transaction-dashboard"))
+
+        self.assertEqual(response.data["kpis"]["total_expense"], 10.0)
+        # data version only; the JWT user state is cached by now
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_transaction_writes_invalidate(self):
+        expense = self.add_expense(10)
+        self.assertEqual(self.total_expense(), 10.0)
+
+        expense.amount = 15
+        expense.save()
+        self.assertEqual(self.total_expense(), 15.0)
+
+        expense.delete()
+        self.assertEqual(self.total_expense(), 0.0)
+
+    def test_budget_writes_invalidate(self):
+        self.add_expense(50)
+        self.client.get(reverse("transaction-dashboard"))
+
+        Budget.objects.create(
+            user=self.user,
+            category=self.category_food,
+            limit_amount=100,
+            period="MONTHLY",
+            start_date=timezone.now().date(),
+            end_date=(timezone.now() + timedelta(days=30)).date(),
+        )
+
+        kpis = self.client.get(reverse("transaction-dashboard")).data["kpis"]
+        self.assertEqual(kpis["monthly_budget_used"], 50.0)
+
+    def test_bulk_load_invalidates_monthly_expense(self):
+        self.assertEqual(self.client.get(reverse("monthly_expense")).data, {})
+
+        df = pd.DataFrame(
+            {
+                "date": [timezone.now().strftime("%Y-%m-%d %H:%M:%S")],
+                "amount": [-30],
+                "category": ["Food"],
+                "description": ["Groceries"],
+            }
+        )
+        load_transactions(transform_transaction(df), self.user)
+
+        response = self.client.get(reverse("monthly_expense"))
+        self.assertEqual(response.data, {timezone.now().strftime("%B %Y"): 30.0})
+
+    def test_metrics_are_admin_only(self):
+        self.client.get(reverse("transaction-dashboard"))
+        self.client.get(reverse("transaction-dashboard"))
+
+        self.assertEqual(self.client.get(reverse("cache_metrics")).status_code, 403)
+
+        User.objects.create_user(username="admin", password="adminpass", role="admin")
+        self.login("admin", "adminpass")
+        response = self.client.get(reverse("cache_metrics"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["dashboard"], {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+        )
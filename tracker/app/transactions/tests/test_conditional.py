@@ -0,0 +1,86 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from transactions.models import Transaction, Category
+
+User = get_user_model()
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="etaguser", password="etagpass")
+        self.category_food = Category.objects.create(name="Food")
+        response = self.client.post(
+            reverse("login"),
+            {"username": "etaguser", "password": "etagpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+        self.add_expense(10)
+
+    def add_expense(self, amount):
+        return Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=amount,
+            category=self.category_food,
+            date=timezone.now(),
+        )
+
+    def test_matching_etag_returns_304_without_work(self):
+        for name in ["transaction-dashboard", "transaction-list", "budget-list"]:
+            with self.subTest(endpoint=name):
+                response = self.client.get(reverse(name))
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Last-Modified", response)
+
+                with CaptureQueriesContext(connection) as ctx:
+                    response = self.client.get(
+                        reverse(name), HTTP_IF_NONE_MATCH=response["ETag"]
+                    )
+
+                self.assertEqual(response.status_code, 304)
+                # data version only; the JWT user state is cached by now
+                self.assertEqual(len(ctx.captured_queries), 1)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(reverse("transaction-dashboard"))["ETag"]
+
+        self.add_expense(5)
+        response = self.client.get(
+            reverse("transaction-dashboard"), HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["kpis"]["total_expense"], 15.0)
+
+    def test_etag_varies_with_query(self):
+        plain = self.client.get(reverse("transaction-list"))["ETag"]
+        filtered = self.client.get(
+            reverse("transaction-list"), {"transaction_type": "INCOME"}
+        )["ETag"]
+
+        self.assertNotEqual(plain, filtered)
+
+    def test_category_changes_change_the_etag(self):
+        etag = self.client.get(reverse("transaction-list"))["ETag"]
+
+        self.client.patch(
+            reverse("category-detail", args=[self.category_food.id]),
+            {"name": "Food Shopping"},
+            format="json",
+        )
+        response = self.client.get(reverse("transaction-list"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["category"], "Food Shopping")
+
+        etag = response["ETag"]
+        self.category_food.delete()
+        response = self.client.get(reverse("transaction-list"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
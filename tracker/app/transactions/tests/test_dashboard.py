@@ -1,8 +1,12 @@
 from rest_framework.test import APITestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.db.models import Sum
 from django.utils import timezone
+from datetime import timedelta
 from transactions.models import Transaction, Category, Budget
 
 User = get_user_model()
@@ -43,12 +47,24 @@ class DashboardTests(APITestCase):
         self.assertIn("yearly", response.data)
         self.assertIn("kpis", response.data)
 
+    def test_dashboard_series(self):
+        response = self.client.get(reverse("transaction-dashboard"))
+        month = timezone.now().strftime("%b")
+        year = str(timezone.now().year)
+
+        self.assertEqual(response.data["monthly"]["expenses"], {month: 100.0})
+        self.assertEqual(response.data["monthly"]["income"], {month: 500.0})
+        self.assertEqual(response.data["yearly"]["expenses"], {year: 100.0})
+        self.assertEqual(response.data["yearly"]["income"], {year: 500.0})
+
     def test_dashboard_kpis(self):
         Budget.objects.create(
             user=self.user,
             category=self.category_food,
             limit_amount=200,
             period="MONTHLY",
+            start_date=timezone.now().date(),
+            end_date=(timezone.now() + timedelta(days=30)).date(),
             is_active=True,
         )
 
@@ -90,3 +106,29 @@ class DashboardTests(APITestCase):
         self.assertEqual(kpis["total_expense"], float(expense_total))
         self.assertEqual(kpis["net_savings"], float(net_savings))
         self.assertEqual(kpis["budget_used_percentage"], budget_used_percentage)
+
+    def test_dashboard_query_count_is_constant(self):
+        def dashboard_queries():
+            cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(reverse("transaction-dashboard"))
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+
+        dashboard_queries()  # caches the JWT user state
+        baseline = dashboard_queries()
+
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user,
+                transaction_type="EXPENSE" if i % 2 else "INCOME",
+                amount=10 + i,
+                category=self.category_food if i % 2 else None,
+                date=timezone.now() - timedelta(days=30 * i),
+            )
+            for i in range(60)
+        )
+
+        self.assertEqual(dashboard_queries(), baseline)
+        # data version + monthly totals + active budgets (none, so no expenses query)
+        self.assertEqual(baseline, 3)
@@ -0,0 +1,206 @@
+import io
+import json
+import os
+import tempfile
+
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.contrib.auth import get_user_model
+from transactions.models import Transaction, MonthlyRollup, EtlRun
+from transactions.etl.load import load_transactions
+from transactions.etl.pipeline import import_transactions
+from transactions.etl.transform import transform_transaction
+
+User = get_user_model()
+
+
+class RunEtlCommandMixin:
+    def setUp(self):
+        self.csv_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.csv_dir.cleanup)
+
+    def write_csv(self, username, rows):
+        pd.DataFrame(rows).to_csv(
+            os.path.join(self.csv_dir.name, f"fake_transactions_{username}.csv"),
+            index=False,
+        )
+
+    def write_valid_csv(self, username):
+        self.write_csv(
+            username,
+            {
+                "date": ["2024-01-05 10:00:00", "2024-01-06 11:00:00"],
+                "amount": [-20, 300],
+                "category": ["Food", ""],
+                "description": ["Lunch", "Salary"],
+            },
+        )
+
+    def run_etl(self, workers, **options):
+        out = io.StringIO()
+        call_command(
+            "run_etl", workers=workers, csv_dir=self.csv_dir.name, stdout=out, **options
+        )
+        return out.getvalue()
+
+
+class RunEtlCommandTests(RunEtlCommandMixin, TestCase):
+    def test_failures_are_isolated_per_user(self):
+        good = User.objects.create_user(username="good", password="pass")
+        User.objects.create_user(username="broken", password="pass")
+        User.objects.create_user(username="nofile", password="pass")
+        self.write_valid_csv("good")
+        self.write_csv("broken", {"unexpected": [1, 2]})
+
+        output = self.run_etl(workers=1)
+
+        self.assertEqual(Transaction.objects.filter(user=good).count(), 2)
+        self.assertIn("CSV not found for nofile", output)
+        self.assertIn("broken: FAILED", output)
+        self.assertIn("imported=2 | failed=1", output)
+        self.assertEqual(
+            sorted(EtlRun.objects.values_list("user__username", "status")),
+            [("broken", "FAILED"), ("good", "COMPLETED")],
+        )
+
+    def test_run_report_and_history(self):
+        User.objects.create_user(username="staged", password="pass")
+        self.write_csv(
+            "staged",
+            {
+                "date": ["2024-01-05 10:00:00", "not a date", "2024-01-07 09:00:00"],
+                "amount": [-20, 15, 300],
+                "category": ["Food", "Food", ""],
+                "description": ["Lunch", "Broken", "Salary"],
+            },
+        )
+        report_path = os.path.join(self.csv_dir.name, "report.json")
+
+        self.run_etl(workers=1, report=report_path)
+
+        run = EtlRun.objects.get()
+        self.assertEqual(
+            (run.status, run.rows, run.imported, run.dropped), ("COMPLETED", 3, 2, 1)
+        )
+        self.assertEqual(set(run.stages), {"extract", "transform", "load"})
+        self.assertEqual(run.stages["transform"]["rows_dropped"], 1)
+        self.assertEqual(run.stages["load"]["rows_out"], 2)
+        # Allocations are only traced on request.
+        self.assertIsNone(run.peak_memory_mb)
+        self.assertIsNotNone(run.stages["load"]["rss_delta_mb"])
+
+        with open(report_path) as f:
+            report = json.load(f)
+        self.assertEqual(report["runs"][0]["id"], run.id)
+        self.assertEqual(report["runs"][0]["stages"]["extract"]["rows_out"], 3)
+
+    def test_traced_run_reports_peak_memory_per_stage(self):
+        User.objects.create_user(username="traced", password="pass")
+        self.write_valid_csv("traced")
+
+        self.run_etl(workers=1, trace_memory=True)
+
+        run = EtlRun.objects.get()
+        self.assertGreater(run.peak_memory_mb, 0)
+        self.assertEqual(
+            run.peak_memory_mb,
+            max(stats["peak_memory_mb"] for stats in run.stages.values()),
+        )
+
+
+class ParallelRunEtlCommandTests(RunEtlCommandMixin, TransactionTestCase):
+    def test_users_are_processed_in_worker_processes(self):
+        for username in ["alice", "bob", "carol"]:
+            User.objects.create_user(username=username, password="pass")
+            self.write_valid_csv(username)
+
+        output = self.run_etl(workers=2)
+
+        self.assertEqual(Transaction.objects.count(), 6)
+        self.assertIn("Processed 3 users", output)
+        self.assertIn("failed=0", output)
+
+
+class LoadStrategyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="loader", password="pass")
+
+    def frame(self):
+        return transform_transaction(
+            pd.DataFrame(
+                {
+                    "date": ["2024-01-05 10:00:00", "2024-02-06 11:30:15"],
+                    "amount": [-20.5, 300],
+                    "category": ["food", ""],
+                    "description": ["Lunch, with \"quotes\"", None],
+                }
+            )
+        )
+
+    def loaded_rows(self):
+        return list(
+            Transaction.objects.order_by("date").values_list(
+                "transaction_type", "amount", "category__name", "description", "date"
+            )
+        )
+
+    def test_copy_matches_bulk_create(self):
+        self.assertEqual(
+            load_transactions(self.frame(), self.user, "bulk_create")["inserted"], 2
+        )
+        expected = self.loaded_rows()
+        expected_rollups = list(MonthlyRollup.objects.values_list("total", "count"))
+        Transaction.objects.all().delete()
+        MonthlyRollup.objects.all().delete()
+
+        self.assertEqual(load_transactions(self.frame(), self.user, "copy")["inserted"], 2)
+
+        self.assertEqual(self.loaded_rows(), expected)
+        self.assertEqual(
+            list(MonthlyRollup.objects.values_list("total", "count")), expected_rollups
+        )
+
+    def test_reload_skips_duplicates(self):
+        for strategy in ["bulk_create", "copy"]:
+            with self.subTest(strategy=strategy):
+                Transaction.objects.all().delete()
+                MonthlyRollup.objects.all().delete()
+                # Rows repeated within one load are separate transactions.
+                frame = pd.concat([self.frame(), self.frame()])
+                self.assertEqual(
+                    load_transactions(frame, self.user, strategy),
+                    {"inserted": 4, "duplicates": 0},
+                )
+                rollups = list(MonthlyRollup.objects.values_list("total", "count"))
+
+                result = load_transactions(frame, self.user, strategy)
+
+                self.assertEqual(result, {"inserted": 0, "duplicates": 4})
+                self.assertEqual(Transaction.objects.count(), 4)
+                self.assertEqual(
+                    list(MonthlyRollup.objects.values_list("total", "count")), rollups
+                )
+
+    def test_repeats_are_numbered_across_chunks(self):
+        source = io.StringIO(
+            "date,amount,category,description\n"
+            "2024-01-05 10:00:00,-3.5,Food,Coffee\n"
+            "2024-01-05 10:00:00,-3.5,Food,Coffee\n"
+        )
+        progress = import_transactions(source, self.user, chunksize=1, filename="a.csv")
+        self.assertEqual((progress["imported"], progress["duplicates"]), (2, 0))
+
+        source.seek(0)
+        progress = import_transactions(source, self.user, chunksize=1, filename="a.csv")
+        self.assertEqual((progress["imported"], progress["duplicates"]), (0, 2))
+
+        # Editing the repeat keeps its numbered fingerprint.
+        repeat = Transaction.objects.order_by("id").last()
+        repeat.category = None
+        repeat.save()
+        self.assertEqual(Transaction.objects.values("fingerprint").distinct().count(), 2)
+
+    def test_unknown_strategy(self):
+        with self.assertRaises(ValueError):
+            load_transactions(self.frame(), self.user, "carrier-pigeon")
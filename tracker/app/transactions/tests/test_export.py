@@ -0,0 +1,80 @@
+import csv
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+import pandas as pd
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from transactions.models import Transaction, Category
+
+User = get_user_model()
+
+
+@override_settings(TRANSACTION_EXPORT_CHUNK_SIZE=2)
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exporter", password="exportpass")
+        other = User.objects.create_user(username="other", password="otherpass")
+        food = Category.objects.create(name="Food")
+        now = timezone.now()
+        for i in range(5):
+            Transaction.objects.create(
+                user=self.user,
+                transaction_type="EXPENSE",
+                amount=Decimal("10.25") + i,
+                category=food,
+                description=f'Lunch, "{i}"',
+                date=now - timedelta(days=i),
+            )
+        Transaction.objects.create(
+            user=self.user, transaction_type="INCOME", amount=900, date=now
+        )
+        Transaction.objects.create(
+            user=other, transaction_type="INCOME", amount=1, date=now
+        )
+
+        response = self.client.post(
+            reverse("login"),
+            {"username": "exporter", "password": "exportpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def export(self, **params):
+        response = self.client.get(reverse("transaction-export"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content)
+
+    def test_csv_export_applies_list_filters(self):
+        rows = list(
+            csv.DictReader(
+                io.StringIO(self.export(transaction_type="EXPENSE").decode())
+            )
+        )
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]["description"], 'Lunch, "0"')
+        self.assertEqual(rows[0]["category"], "Food")
+        self.assertEqual([row["amount"] for row in rows][-1], "14.25")
+
+    def test_parquet_export(self):
+        frame = pd.read_parquet(io.BytesIO(self.export(file_format="parquet")))
+
+        self.assertEqual(len(frame), 6)
+        self.assertEqual(
+            list(frame.columns),
+            ["id", "date", "transaction_type", "amount", "category", "description"],
+        )
+        self.assertEqual(frame["amount"].sum(), Decimal("961.25"))
+
+    def test_unknown_format(self):
+        response = self.client.get(
+            reverse("transaction-export"), {"file_format": "xml"}
+        )
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,79 @@
+import re
+
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from transactions.middleware import reset_request_metrics
+from transactions.models import Transaction
+
+User = get_user_model()
+
+
+@override_settings(REQUEST_INSTRUMENTATION=True)
+class RequestInstrumentationTests(APITestCase):
+    def setUp(self):
+        reset_request_metrics()
+        self.addCleanup(reset_request_metrics)
+        self.admin = User.objects.create_user(
+            username="admin", password="adminpass", role="admin"
+        )
+        response = self.client.post(
+            reverse("login"),
+            {"username": "admin", "password": "adminpass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def test_server_timing_header(self):
+        with self.assertLogs("instrumentation") as logs:
+            response = self.client.get(reverse("transaction-list"))
+
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^db;dur=[\d.]+;desc="\d+ queries", serialize;dur=[\d.]+, '
+            r'render;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+        self.assertIn("route='GET transaction-list' status=200", logs.output[0])
+        self.assertEqual(logs.records[0].route, "GET transaction-list")
+
+    def test_admin_reads_per_route_histograms(self):
+        for _ in range(3):
+            self.client.get(reverse("transaction-list"))
+
+        response = self.client.get(reverse("request_metrics"))
+
+        stats = response.data["GET transaction-list"]
+        self.assertEqual(stats["count"], 3)
+        self.assertEqual(sum(stats["histogram_ms"].values()), 3)
+        self.assertGreater(stats["avg_queries"], 0)
+        self.assertIn("POST login", response.data)
+
+    def test_serializer_time_is_measured(self):
+        Transaction.objects.create(
+            user=self.admin, transaction_type="INCOME", amount=100, date=timezone.now()
+        )
+
+        response = self.client.get(reverse("transaction-list"))
+
+        serialize_ms = float(
+            re.search(r"serialize;dur=([\d.]+)", response["Server-Timing"]).group(1)
+        )
+        self.assertGreater(serialize_ms, 0)
+
+    def test_metrics_are_admin_only(self):
+        User.objects.create_user(username="user", password="userpass")
+        response = self.client.post(
+            reverse("login"), {"username": "user", "password": "userpass"}, format="json"
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+        self.assertEqual(self.client.get(reverse("request_metrics")).status_code, 403)
+
+
+class InstrumentationDisabledTests(APITestCase):
+    def test_disabled_by_default(self):
+        response = self.client.get(reverse("transaction-list"))
+
+        self.assertNotIn("Server-Timing", response)
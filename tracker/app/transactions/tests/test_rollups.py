@@ -0,0 +1,164 @@
+import io
+from datetime import timedelta
+from decimal import Decimal
+
+import pandas as pd
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from transactions.cache import bump_data_version
+from transactions.models import Transaction, Category, MonthlyRollup, UserDataVersion
+from transactions.etl.pipeline import import_transactions
+
+User = get_user_model()
+
+
+def rollup_snapshot(user):
+    return sorted(
+        MonthlyRollup.objects.filter(user=user).values_list(
+            "month", "transaction_type", "category_id", "total", "count"
+        )
+    )
+
+
+class MonthlyRollupTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="rollupuser", password="rolluppass"
+        )
+        self.category_food = Category.objects.create(name="Food")
+        self.category_travel = Category.objects.create(name="Travel")
+
+        response = self.client.post(
+            reverse("login"),
+            {"username": "rollupuser", "password": "rolluppass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def assertRollupsMatchRebuild(self):
+        incremental = rollup_snapshot(self.user)
+        call_command("rebuild_rollups", stdout=io.StringIO())
+        self.assertEqual(incremental, rollup_snapshot(self.user))
+
+    def test_create_update_delete_keep_rollups_in_sync(self):
+        now = timezone.now()
+        expense = Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=Decimal("40.00"),
+            category=self.category_food,
+            date=now,
+        )
+        Transaction.objects.create(
+            user=self.user, transaction_type="INCOME", amount=500, date=now
+        )
+        rollup = MonthlyRollup.objects.get(
+            user=self.user, transaction_type="EXPENSE", category=self.category_food
+        )
+        self.assertEqual((rollup.total, rollup.count), (Decimal("40.00"), 1))
+
+        expense.amount = Decimal("25.50")
+        expense.category = self.category_travel
+        expense.date = now - timedelta(days=62)
+        expense.save()
+        self.assertFalse(
+            MonthlyRollup.objects.filter(category=self.category_food).exists()
+        )
+        self.assertRollupsMatchRebuild()
+
+        expense.delete()
+        self.assertEqual(
+            list(
+                MonthlyRollup.objects.filter(user=self.user).values_list(
+                    "transaction_type", flat=True
+                )
+            ),
+            ["INCOME"],
+        )
+        self.assertRollupsMatchRebuild()
+
+    def test_string_and_naive_dates_are_normalized(self):
+        from_string = Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount="12.50",
+            category=self.category_food,
+            date="2024-01-06T10:00:00Z",
+        )
+        naive = Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=Decimal("7.50"),
+            category=self.category_food,
+            date=timezone.datetime(2024, 1, 7, 9, 30),
+        )
+        self.assertTrue(timezone.is_aware(from_string.date))
+        self.assertTrue(timezone.is_aware(naive.date))
+        rollup = MonthlyRollup.objects.get(user=self.user, category=self.category_food)
+        self.assertEqual((rollup.total, rollup.count), (Decimal("20.00"), 2))
+        self.assertRollupsMatchRebuild()
+
+    def test_import_updates_rollups(self):
+        df = pd.DataFrame(
+            {
+                "amount": [-20, -30, 200],
+                "category": ["Food", "food", ""],
+                "description": ["Coffee", "Lunch", "Salary"],
+                "date": [timezone.now()] * 3,
+            }
+        )
+        csv_file = io.StringIO()
+        df.to_csv(csv_file, index=False)
+        csv_file.seek(0)
+
+        import_transactions(csv_file, self.user, filename="transactions.csv")
+
+        rollup = MonthlyRollup.objects.get(
+            user=self.user, transaction_type="EXPENSE", category=self.category_food
+        )
+        self.assertEqual((rollup.total, rollup.count), (Decimal("50.00"), 2))
+        self.assertRollupsMatchRebuild()
+
+    def test_monthly_expense_reads_rollups(self):
+        Transaction.objects.create(
+            user=self.user,
+            transaction_type="EXPENSE",
+            amount=75,
+            category=self.category_food,
+            date=timezone.now(),
+        )
+
+        response = self.client.get(reverse("monthly_expense"))
+
+        self.assertEqual(response.data, {timezone.now().strftime("%B %Y"): 75.0})
+
+    def test_user_delete_skips_per_row_bookkeeping(self):
+        deleted = []
+
+        def delete_queries(count):
+            user = User.objects.create_user(username=f"leaving{count}", password="x")
+            deleted.append(user.id)
+            Transaction.objects.bulk_create(
+                Transaction(
+                    user=user,
+                    transaction_type="EXPENSE",
+                    amount=10,
+                    category=self.category_food,
+                    date=timezone.now(),
+                    fingerprint=f"leaving-{count}-{i}",
+                )
+                for i in range(count)
+            )
+            bump_data_version(user.id)
+            with CaptureQueriesContext(connection) as ctx:
+                user.delete()
+            return len(ctx.captured_queries)
+
+        self.assertEqual(delete_queries(2), delete_queries(40))
+        self.assertFalse(Transaction.objects.exists())
+        self.assertFalse(UserDataVersion.objects.filter(user_id__in=deleted).exists())
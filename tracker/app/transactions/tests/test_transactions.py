@@ -1,8 +1,12 @@
-from rest_framework.test import APITestCase
+from rest_framework.test import APITestCase, APITransactionTestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from transactions.models import Transaction, Category
+from transactions.categories import category_cache, get_category_id
 from django.utils import timezone
+from datetime import timedelta
 
 User = get_user_model()
 
@@ -36,3 +40,207 @@ class TransactionTests(BaseTestCase):
         response = self.client.post(reverse("transaction-list"), data, format="json")
         self.assertEqual(response.status_code, 201)
         self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_create_duplicate_transaction(self):
+        data = {
+            "transaction_type": "EXPENSE",
+            "amount": 50.0,
+            "category": "Food",
+            "description": "Lunch",
+            "date": timezone.now().isoformat(),
+        }
+        self.client.post(reverse("transaction-list"), data, format="json")
+        response = self.client.post(reverse("transaction-list"), data, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("already exists", str(response.data))
+        self.assertEqual(Transaction.objects.count(), 1)
+
+
+class CategoryCacheTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        category_cache.clear()
+        self.addCleanup(category_cache.clear)
+
+    def category_queries(self, ctx):
+        return [q for q in ctx.captured_queries if "transactions_category" in q["sql"]]
+
+    def test_cached_category_skips_lookup_on_create(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(get_category_id(" food "), self.category_food.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse("transaction-list"),
+                {
+                    "transaction_type": "EXPENSE",
+                    "amount": 12.5,
+                    "category": "FOOD",
+                    "date": timezone.now().isoformat(),
+                },
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["category"], "Food")
+        self.assertEqual(self.category_queries(ctx), [])
+        self.assertEqual(
+            Transaction.objects.get().category_id, self.category_food.id
+        )
+
+    def test_signals_keep_cache_in_sync(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category_food.name = "groceries"
+            self.category_food.save()
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(get_category_id("Groceries"), self.category_food.id)
+        self.assertEqual(self.category_queries(ctx), [])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category_food.delete()
+            new_id = get_category_id("Groceries")
+
+        self.assertNotEqual(new_id, self.category_food.id)
+        self.assertTrue(Category.objects.filter(id=new_id, name="Groceries").exists())
+
+
+class TransactionPaginationTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        now = timezone.now()
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user,
+                transaction_type="EXPENSE" if i % 3 else "INCOME",
+                amount=10 + i % 4,
+                category=self.category_food if i % 3 else None,
+                # pairs of rows share a date so ties must be broken by id
+                date=now - timedelta(days=i // 2),
+            )
+            for i in range(25)
+        )
+
+    def collect_pages(self, **params):
+        ids = []
+        pages = 0
+        response = self.client.get(reverse("transaction-list"), {"page_size": 10, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            ids.extend(item["id"] for item in response.data["results"])
+            pages += 1
+            if not response.data["next"]:
+                return ids, pages
+            response = self.client.get(response.data["next"])
+
+    def test_pages_follow_date_then_id(self):
+        ids, pages = self.collect_pages()
+
+        expected = list(
+            Transaction.objects.order_by("-date", "-id").values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_rows_sharing_a_date_past_the_offset_cutoff(self):
+        # DRF's cursor steps over ties with an offset capped at 1000 rows.
+        midnight = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user,
+                transaction_type="INCOME",
+                amount=5,
+                date=midnight,
+                fingerprint=f"tied-{i}",
+            )
+            for i in range(1205)
+        )
+        expected = list(
+            Transaction.objects.order_by("-date", "-id").values_list("id", flat=True)
+        )
+
+        ids = []
+        response = self.client.get(reverse("transaction-list"), {"page_size": 100})
+        while response.data["next"]:
+            ids.extend(item["id"] for item in response.data["results"])
+            last_page = response
+            response = self.client.get(response.data["next"])
+        ids.extend(item["id"] for item in response.data["results"])
+        self.assertEqual(ids, expected)
+
+        previous = self.client.get(response.data["previous"])
+        self.assertEqual(previous.data["results"], last_page.data["results"])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(reverse("transaction-list"), {"cursor": "cD1ub3Q"})
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_pagination_with_filter_and_amount_ordering(self):
+        ids, _ = self.collect_pages(transaction_type="EXPENSE", ordering="amount")
+
+        expected = list(
+            Transaction.objects.filter(transaction_type="EXPENSE")
+            .order_by("amount", "id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+
+class StaleCategoryCacheTests(APITransactionTestCase):
+    # Needs real commits: the foreign key check is deferred to COMMIT.
+    def setUp(self):
+        category_cache.clear()
+        self.addCleanup(category_cache.clear)
+        User.objects.create_user(username="staleuser", password="stalepass")
+        response = self.client.post(
+            reverse("login"),
+            {"username": "staleuser", "password": "stalepass"},
+            format="json",
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {response.data['access']}")
+
+    def delete_behind_cache(self, name):
+        # As another process would: this process keeps the id cached.
+        category_id = get_category_id(name)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {Category._meta.db_table} WHERE id = %s", [category_id]
+            )
+        return category_id
+
+    def item(self, description):
+        return {
+            "transaction_type": "EXPENSE",
+            "amount": 12,
+            "category": "Food",
+            "description": description,
+            "date": timezone.now().isoformat(),
+        }
+
+    def test_create_retries_with_a_fresh_category(self):
+        stale_id = self.delete_behind_cache("Food")
+
+        response = self.client.post(
+            reverse("transaction-list"), self.item("Lunch"), format="json"
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertNotEqual(Transaction.objects.get().category_id, stale_id)
+        self.assertEqual(Transaction.objects.get().category.name, "Food")
+
+    def test_bulk_create_retries_with_a_fresh_category(self):
+        stale_id = self.delete_behind_cache("Food")
+
+        response = self.client.post(
+            reverse("transaction-bulk"),
+            [self.item("Lunch"), self.item("Dinner")],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [r["status"] for r in response.data], ["created", "created"]
+        )
+        self.assertFalse(Transaction.objects.filter(category_id=stale_id).exists())
@@ -0,0 +1,63 @@
+import pandas as pd
+from datetime import timezone as dt_timezone
+from django.test import SimpleTestCase
+from transactions.etl.transform import transform_transaction
+
+
+class TransformTransactionTests(SimpleTestCase):
+    def test_transform_output(self):
+        df = pd.DataFrame(
+            {
+                "date": [
+                    "2024-01-05 10:00:00",
+                    "not a date",
+                    "2024-02-01 00:00:00",
+                    "2024-03-01 00:00:00",
+                ],
+                "amount": [-12.5, 10, 300.0, 0],
+                "category": ["  food ", "Travel", None, ""],
+                "description": ["Lunch", "x", "None", "Refund"],
+            }
+        )
+
+        result = transform_transaction(df)
+
+        self.assertEqual(result.index.tolist(), [0, 2, 3])
+        self.assertEqual(
+            result["date"].tolist(),
+            [
+                pd.Timestamp("2024-01-05 10:00:00", tz="UTC"),
+                pd.Timestamp("2024-02-01", tz="UTC"),
+                pd.Timestamp("2024-03-01", tz="UTC"),
+            ],
+        )
+        self.assertEqual(
+            result["category"].tolist(), ["Food", "Miscellaneous", "Miscellaneous"]
+        )
+        self.assertEqual(
+            result["transaction_type"].tolist(), ["EXPENSE", "INCOME", "INCOME"]
+        )
+        self.assertEqual(result["amount"].tolist(), [12.5, 300.0, 0])
+        self.assertEqual(result["description"].tolist(), ["Lunch", None, "Refund"])
+
+    def test_aware_dates_are_kept(self):
+        df = pd.DataFrame(
+            {
+                "date": [pd.Timestamp("2024-01-05 10:00", tz="Europe/Paris")],
+                "amount": [-5],
+                "category": ["food"],
+                "description": ["Coffee"],
+            }
+        )
+
+        result = transform_transaction(df)
+
+        self.assertEqual(
+            result["date"].iloc[0].astimezone(dt_timezone.utc),
+            pd.Timestamp("2024-01-05 09:00", tz="UTC"),
+        )
+
+    def test_empty_frame(self):
+        df = pd.DataFrame(columns=["date", "amount", "category", "description"])
+
+        self.assertTrue(transform_transaction(df).empty)
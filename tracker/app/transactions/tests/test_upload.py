@@ -1,16 +1,30 @@
 import io
+import shutil
+import tempfile
+from datetime import timedelta
 import pandas as pd
+from django.test import override_settings
 from django.utils import timezone
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
-from transactions.models import Transaction, Category
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from transactions.models import Transaction, Category, ImportJob
+from transactions.categories import category_cache, resolve_category_ids
+from transactions.jobs import process_next_job
 
 User = get_user_model()
 
 
 class BaseUploadTestCase(APITestCase):
     def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_override = override_settings(MEDIA_ROOT=media_root)
+        media_override.enable()
+        self.addCleanup(media_override.disable)
+
         self.user = User.objects.create_user(
             username="uploaduser", password="uploadpass"
         )
@@ -24,6 +38,25 @@ class BaseUploadTestCase(APITestCase):
         self.token = response.data["access"]
         self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
 
+    def csv_file(self, df):
+        csv_file = io.StringIO()
+        df.to_csv(csv_file, index=False)
+        csv_file.seek(0)
+        csv_file.name = "transactions.csv"
+        return csv_file
+
+    def upload(self, file):
+        return self.client.post(
+            reverse("transaction-upload-file"), {"file": file}, format="multipart"
+        )
+
+    def upload_and_import(self, file):
+        response = self.upload(file)
+        self.assertEqual(response.status_code, 202)
+        job = process_next_job()
+        self.assertEqual(job.id, response.data["job_id"])
+        return job
+
 
 class UploadFileTests(BaseUploadTestCase):
     def test_upload_csv_file_success(self):
@@ -37,17 +70,35 @@ class UploadFileTests(BaseUploadTestCase):
                 "date": [timezone.now(), timezone.now()],
             }
         )
-        csv_file = io.StringIO()
-        df.to_csv(csv_file, index=False)
-        csv_file.seek(0)
-        csv_file.name = "transactions.csv"
 
-        response = self.client.post(
-            reverse("transaction-upload-file"), {"file": csv_file}, format="multipart"
+        response = self.upload(self.csv_file(df))
+
+        self.assertEqual(response.status_code, 202)
+        self.assertIn("import queued", response.data["message"])
+        self.assertEqual(response.data["status"], "PENDING")
+        self.assertEqual(Transaction.objects.count(), 0)
+
+        job = process_next_job()
+
+        self.assertEqual(job.status, "COMPLETED")
+        self.assertEqual(job.rows_imported, 2)
+        self.assertEqual(Transaction.objects.count(), 2)
+
+    def test_reupload_is_idempotent(self):
+        df = pd.DataFrame(
+            {
+                "amount": [-20, 200],
+                "category": ["Food", ""],
+                "description": ["Coffee", "Salary"],
+                "date": [timezone.now(), timezone.now()],
+            }
         )
 
-        self.assertEqual(response.status_code, 200)
-        self.assertIn("transactions imported successfully", response.data["message"])
+        for expected_imported, expected_duplicates in [(2, 0), (0, 2)]:
+            job = self.upload_and_import(self.csv_file(df))
+
+            self.assertEqual(job.rows_imported, expected_imported)
+            self.assertEqual(job.duplicates, expected_duplicates)
         self.assertEqual(Transaction.objects.count(), 2)
 
     def test_upload_invalid_file_type(self):
@@ -65,3 +116,142 @@ class UploadFileTests(BaseUploadTestCase):
         )
         self.assertEqual(response.status_code, 400)
         self.assertIn("No file uploaded", response.data["error"])
+
+
+class ImportJobTests(BaseUploadTestCase):
+    def test_job_progress_endpoint(self):
+        df = pd.DataFrame(
+            {
+                "amount": [-20, 200],
+                "category": ["Food", ""],
+                "description": ["Coffee", "Salary"],
+                "date": [timezone.now(), timezone.now()],
+            }
+        )
+        job = self.upload_and_import(self.csv_file(df))
+
+        response = self.client.get(reverse("import-job-detail", args=[job.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "COMPLETED")
+        self.assertEqual(response.data["rows_processed"], 2)
+        self.assertEqual(response.data["rows_imported"], 2)
+        self.assertEqual(response.data["error"], "")
+        self.assertIn("rows_per_second", response.data)
+
+    def test_failed_job_reports_error(self):
+        job = self.upload_and_import(self.csv_file(pd.DataFrame({"unexpected": [1]})))
+
+        self.assertEqual(job.status, "FAILED")
+        self.assertIn("date", job.error)
+
+    def test_stalled_running_job_is_reclaimed(self):
+        df = pd.DataFrame(
+            {
+                "amount": [-20, 200],
+                "category": ["Food", ""],
+                "description": ["Coffee", "Salary"],
+                "date": [timezone.now(), timezone.now()],
+            }
+        )
+        response = self.upload(self.csv_file(df))
+        stalled = timezone.now() - timedelta(seconds=601)
+        ImportJob.objects.filter(pk=response.data["job_id"]).update(
+            status="RUNNING", started_at=stalled, heartbeat_at=stalled
+        )
+
+        with override_settings(IMPORT_JOB_STALE_AFTER=3600):
+            self.assertIsNone(process_next_job())
+        with override_settings(IMPORT_JOB_STALE_AFTER=600), self.assertLogs(
+            "transactions.jobs", "WARNING"
+        ):
+            job = process_next_job()
+
+        self.assertEqual(job.id, response.data["job_id"])
+        self.assertEqual((job.status, job.rows_imported), ("COMPLETED", 2))
+
+    def test_jobs_are_private(self):
+        other = User.objects.create_user(username="other", password="otherpass")
+        job = ImportJob.objects.create(user=other, filename="other.csv")
+
+        response = self.client.get(reverse("import-job-detail", args=[job.id]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+@override_settings(TRANSACTION_IMPORT_CHUNK_SIZE=2)
+class ChunkedUploadTests(BaseUploadTestCase):
+    def build_frame(self, rows):
+        return pd.DataFrame(
+            {
+                "amount": [-10 - i for i in range(rows)],
+                "category": ["Food"] * rows,
+                "description": [f"Item {i}" for i in range(rows)],
+                "date": [timezone.now().replace(tzinfo=None)] * rows,
+            }
+        )
+
+    def test_csv_is_loaded_in_chunks(self):
+        job = self.upload_and_import(self.csv_file(self.build_frame(5)))
+
+        self.assertEqual(job.chunks, 3)
+        self.assertEqual(Transaction.objects.count(), 5)
+
+    def test_xlsx_is_loaded_in_chunks(self):
+        xlsx_file = io.BytesIO()
+        self.build_frame(3).to_excel(xlsx_file, index=False)
+        xlsx_file.seek(0)
+        xlsx_file.name = "transactions.xlsx"
+
+        job = self.upload_and_import(xlsx_file)
+
+        self.assertEqual(job.chunks, 2)
+        self.assertEqual(Transaction.objects.count(), 3)
+
+
+class CategoryResolutionTests(BaseUploadTestCase):
+    def test_resolve_category_ids_is_set_based(self):
+        category_cache.clear()
+        self.addCleanup(category_cache.clear)
+        names = pd.Series([" food", "Travel", None, "", "travel", "Food "] * 50)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                ids = resolve_category_ids(names)
+
+        # insert of the uncached names, lookup of their ids
+        self.assertEqual(len(ctx.captured_queries), 2)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertTrue(resolve_category_ids(names).equals(ids))
+        self.assertEqual(len(ctx.captured_queries), 0)
+        by_name = dict(Category.objects.values_list("name", "id"))
+        self.assertEqual(
+            ids.iloc[:6].tolist(),
+            [
+                self.category_food.id,
+                by_name["Travel"],
+                by_name["Miscellaneous"],
+                by_name["Miscellaneous"],
+                by_name["Travel"],
+                self.category_food.id,
+            ],
+        )
+
+    def test_upload_assigns_categories_to_expenses_only(self):
+        df = pd.DataFrame(
+            {
+                "amount": [-20, -35, 200],
+                "category": ["food", "Books", ""],
+                "description": ["Coffee", "Novel", "Salary"],
+                "date": [timezone.now()] * 3,
+            }
+        )
+
+        self.upload_and_import(self.csv_file(df))
+
+        self.assertEqual(
+            sorted(
+                Transaction.objects.values_list("transaction_type", "category__name")
+            ),
+            [("EXPENSE", "Books"), ("EXPENSE", "Food"), ("INCOME", None)],
+        )
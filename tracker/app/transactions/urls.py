@@ -1,11 +1,20 @@
 from django.urls import path, include
-from .views import RegisterView, CategoryViewSet, TransactionViewSet, BudgetViewSet
+from .views import (
+    RegisterView,
+    CategoryViewSet,
+    TransactionViewSet,
+    BudgetViewSet,
+    ImportJobViewSet,
+)
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework.routers import DefaultRouter
-from .views import monthly_expense
+from .views import monthly_expense, cache_stats, request_stats
+from . import async_views
 
 router = DefaultRouter()
 router.register(r"categories", CategoryViewSet, basename="category")
+# Registered before "transactions" so its routes win over transaction detail.
+router.register(r"transactions/import-jobs", ImportJobViewSet, basename="import-job")
 router.register(r"transactions", TransactionViewSet, basename="transaction")
 router.register(r"budgets", BudgetViewSet, basename="budget")
 
@@ -15,5 +24,14 @@ urlpatterns = [
     path("login/", TokenObtainPairView.as_view(), name="login"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("transactions/monthly-expense/", monthly_expense, name="monthly_expense"),
+    path("cache/metrics/", cache_stats, name="cache_metrics"),
+    path("metrics/requests/", request_stats, name="request_metrics"),
+    path("async/dashboard/", async_views.dashboard, name="async_dashboard"),
+    path(
+        "async/monthly-expense/",
+        async_views.monthly_expense,
+        name="async_monthly_expense",
+    ),
+    path("async/budgets/", async_views.budget_list, name="async_budget_list"),
     path("", include(router.urls)),
 ]
@@ -1,31 +1,47 @@
-from rest_framework import generics, viewsets, filters
-import pandas as pd
+from rest_framework import generics, viewsets, filters, status
 import logging
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
-from django.db.models import Sum
-from django.db.models.functions import TruncMonth, TruncYear
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser, MultiPartParser, FormParser
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework_simplejwt.views import TokenObtainPairView
-from collections import defaultdict
 
-from .models import Transaction, Category, Budget
+from .models import Transaction, Category, Budget, ImportJob
 from .serializers import (
     TransactionSerializer,
+    TransactionBulkUpdateSerializer,
+    TransactionBulkDeleteSerializer,
+    BulkResultSerializer,
     CategorySerializer,
     BudgetSerializer,
     BudgetReadSerializer,
+    BudgetAlertSerializer,
+    ImportJobSerializer,
+    UploadFileResponseSerializer,
     RegisterSerializer,
     LoginRequestSerializer,
     LoginResponseSerializer,
 )
-from .permissions import IsOwnerOrAdmin
-from transactions.etl.transform import transform_transaction
+from .permissions import IsOwnerOrAdmin, IsAdmin
+from .cache import cached_for_user, cache_metrics
+from .middleware import request_metrics
+from .conditional import conditional_on_data
+from .pagination import TransactionCursorPagination
+from .budgets import budget_alerts
+from .dashboard import build_dashboard, monthly_expenses, shape_monthly_expenses
+from .export import EXPORT_FORMATS, export_rows, parquet_available
+from .bulk import (
+    bulk_create_transactions,
+    bulk_update_transactions,
+    bulk_delete_transactions,
+)
+from transactions.etl.extract import is_supported
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -68,18 +84,25 @@ class TransactionViewSet(viewsets.ModelViewSet):
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ["category", "transaction_type"]
     ordering_fields = ["date", "amount"]
-    ordering = ["-date"]
+    ordering = ["-date", "-id"]
+    pagination_class = TransactionCursorPagination
     parser_classes = [JSONParser, MultiPartParser, FormParser]
 
     def get_queryset(self):
         user = self.request.user
+        transactions = Transaction.objects.select_related("category")
         if user.role == "admin":
-            return Transaction.objects.all()
-        return Transaction.objects.filter(user=user)
+            return transactions
+        return transactions.filter(user=user)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @conditional_on_data("transactions", admin_sees_all=True)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(responses={202: UploadFileResponseSerializer})
     @action(
         detail=False,
         methods=["post"],
@@ -91,159 +114,132 @@ class TransactionViewSet(viewsets.ModelViewSet):
         if not file:
             return Response({"error": "No file uploaded"}, status=400)
 
-        try:
-            if file.name.endswith(".csv"):
-                df = pd.read_csv(file)
-            elif file.name.endswith((".xls", ".xlsx")):
-                df = pd.read_excel(file)
-            else:
-                return Response({"error": "Unsupported file type"}, status=400)
-
-            df = transform_transaction(df)
-
-            transactions = []
-            for _, row in df.iterrows():
-                category_name = (
-                    str(row["category"]).strip()
-                    if pd.notna(row["category"]) and str(row["category"]).strip() != ""
-                    else "Miscellaneous"
-                )
-                category_obj, _ = Category.objects.get_or_create(name=category_name)
-
-                transactions.append(
-                    Transaction(
-                        user=request.user,
-                        transaction_type=row["transaction_type"],
-                        amount=row["amount"],
-                        category=category_obj,
-                        description=row.get("description"),
-                        date=row["date"],
-                    )
-                )
-
-            with transaction.atomic():
-                Transaction.objects.bulk_create(transactions)
+        if not is_supported(file.name):
+            return Response({"error": "Unsupported file type"}, status=400)
 
-            return Response(
-                {"message": f"{len(transactions)} transactions imported successfully"}
-            )
+        # Parsing and loading happen in the import worker; the request only
+        # stores the file and queues the job.
+        job = ImportJob.objects.create(user=request.user, file=file, filename=file.name)
 
-        except Exception as e:
-            logger.exception("Failed to upload transactions")
-            return Response({"error": str(e)}, status=400)
-
-    @action(detail=False, methods=["get"])
-    def dashboard(self, request):
-        user = request.user
-        transactions = Transaction.objects.filter(user=user)
-
-        income_total = (
-            transactions.filter(transaction_type="INCOME").aggregate(
-                total=Sum("amount")
-            )["total"]
-            or 0
-        )
-        expense_total = (
-            transactions.filter(transaction_type="EXPENSE").aggregate(
-                total=Sum("amount")
-            )["total"]
-            or 0
+        return Response(
+            {
+                "message": "File uploaded successfully, import queued",
+                "job_id": job.id,
+                "status": job.status,
+            },
+            status=202,
         )
-        net_savings = income_total - expense_total
 
-        def get_budgets(period):
-            period_map = {"monthly": "MONTHLY", "yearly": "YEARLY"}
-            db_period = period_map.get(period.lower(), period.upper())
-            return Budget.objects.filter(user=user, period=db_period, is_active=True)
+    @extend_schema(
+        request=TransactionSerializer(many=True),
+        responses={200: BulkResultSerializer(many=True)},
+        description=(
+            "Batch writes: POST a list of transactions, PATCH a list of partial "
+            "updates with ids, or DELETE {\"ids\": [...]}. Results follow the "
+            "request order; the whole batch is written in one database transaction."
+        ),
+    )
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request):
+        max_items = settings.TRANSACTION_BULK_MAX_ITEMS
+
+        if request.method == "DELETE":
+            serializer = TransactionBulkDeleteSerializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            ids = serializer.validated_data["ids"]
+            if len(ids) > max_items:
+                return Response(
+                    {"error": f"At most {max_items} items per request"}, status=400
+                )
+            results = bulk_delete_transactions(self.get_queryset(), ids)
+            return Response(results)
 
-        def budget_used(expenses, period):
-            total_budget = (
-                get_budgets(period).aggregate(total=Sum("limit_amount"))["total"] or 0
+        if request.method == "PATCH":
+            serializer = TransactionBulkUpdateSerializer(
+                data=request.data, many=True, partial=True, max_length=max_items
             )
-            return round((expenses / total_budget) * 100, 2) if total_budget > 0 else 0
-
-        kpis = {
-            "total_income": float(income_total),
-            "total_expense": float(expense_total),
-            "net_savings": float(net_savings),
-            "monthly_budget_used": budget_used(
-                transactions.filter(transaction_type="EXPENSE").aggregate(
-                    total=Sum("amount")
-                )["total"]
-                or 0,
-                "monthly",
-            ),
-            "yearly_budget_used": budget_used(
-                transactions.filter(transaction_type="EXPENSE").aggregate(
-                    total=Sum("amount")
-                )["total"]
-                or 0,
-                "yearly",
-            ),
-        }
-
-        if not transactions.exists():
-            return Response(
-                {
-                    "kpis": kpis,
-                    "monthly": {"expenses": {}, "income": {}, "budget": []},
-                    "yearly": {"expenses": {}, "income": {}, "budget": []},
-                }
+        else:
+            serializer = self.get_serializer(
+                data=request.data, many=True, max_length=max_items
             )
+        serializer.is_valid(raise_exception=True)
 
-        def aggregate(trans_type, period):
-            qs = transactions.filter(transaction_type=trans_type)
-            qs = qs.annotate(
-                p=TruncMonth("date") if period == "monthly" else TruncYear("date")
+        if request.method == "PATCH":
+            results = bulk_update_transactions(
+                self.get_queryset(), serializer.validated_data
             )
-            qs = qs.values("p").annotate(total=Sum("amount")).order_by("p")
-            data = defaultdict(float)
-            for item in qs:
-                label = (
-                    item["p"].strftime("%b")
-                    if period == "monthly"
-                    else str(item["p"].year)
-                )
-                data[label] += float(item["total"])
-            return data
+            return Response(results)
+
+        results = bulk_create_transactions(request.user, serializer.validated_data)
+        return Response(results, status=status.HTTP_201_CREATED)
 
-        def get_budget_list(period):
-            return [
-                {"category": b.category.name, "limit_amount": float(b.limit_amount)}
-                for b in get_budgets(period)
-            ]
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("file_format", str, enum=sorted(EXPORT_FORMATS), default="csv")
+        ],
+        responses={200: OpenApiTypes.BINARY},
+        description="Stream transactions as CSV or Parquet, with the list filters applied",
+    )
+    @action(detail=False, methods=["get"], url_path="export")
+    def export(self, request):
+        file_format = request.query_params.get("file_format", "csv")
+        if file_format not in EXPORT_FORMATS:
+            return Response({"error": "Unsupported export format"}, status=400)
+        if file_format == "parquet" and not parquet_available():
+            return Response({"error": "Parquet export requires pyarrow"}, status=400)
+
+        chunk_size = settings.TRANSACTION_EXPORT_CHUNK_SIZE
+        rows = export_rows(self.filter_queryset(self.get_queryset()), chunk_size)
+        content_type, stream = EXPORT_FORMATS[file_format]
+        response = StreamingHttpResponse(stream(rows, chunk_size), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="transactions.{file_format}"'
+        return response
 
+    @action(detail=False, methods=["get"])
+    @conditional_on_data("dashboard")
+    def dashboard(self, request):
         return Response(
-            {
-                "kpis": kpis,
-                "monthly": {
-                    "expenses": aggregate("EXPENSE", "monthly"),
-                    "income": aggregate("INCOME", "monthly"),
-                    "budget": get_budget_list("monthly"),
-                },
-                "yearly": {
-                    "expenses": aggregate("EXPENSE", "yearly"),
-                    "income": aggregate("INCOME", "yearly"),
-                    "budget": get_budget_list("yearly"),
-                },
-            }
+            cached_for_user("dashboard", request, lambda: build_dashboard(request.user))
         )
 
 
+@extend_schema(description="Poll the progress of queued transaction imports")
+class ImportJobViewSet(viewsets.ReadOnlyModelViewSet):
+    serializer_class = ImportJobSerializer
+    permission_classes = [IsAuthenticated, IsOwnerOrAdmin]
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == "admin":
+            return ImportJob.objects.all()
+        return ImportJob.objects.filter(user=user)
+
+
 @extend_schema(responses={200: dict}, description="Get monthly total expenses per user")
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def monthly_expense(request):
-    user = request.user
-    qs = (
-        Transaction.objects.filter(user=user, transaction_type="EXPENSE")
-        .annotate(month=TruncMonth("date"))
-        .values("month")
-        .annotate(total_amount=Sum("amount"))
-        .order_by("month")
-    )
-    data = {item["month"].strftime("%B %Y"): float(item["total_amount"]) for item in qs}
-    return Response(data)
+    def compute():
+        return shape_monthly_expenses(monthly_expenses(request.user))
+
+    return Response(cached_for_user("monthly_expense", request, compute))
+
+
+@extend_schema(responses={200: dict}, description="Response cache hit/miss counters")
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def cache_stats(request):
+    return Response(cache_metrics())
+
+
+@extend_schema(
+    responses={200: dict},
+    description="Per-route latency histograms, query counts and DB/render time",
+)
+@api_view(["GET"])
+@permission_classes([IsAdmin])
+def request_stats(request):
+    return Response(request_metrics())
 
 
 @extend_schema(
@@ -259,14 +255,28 @@ class BudgetViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        if user.role == "admin":
-            return Budget.objects.all()
-        return Budget.objects.filter(user=user)
+        budgets = Budget.objects.select_related("category", "user")
+        if user.role != "admin":
+            budgets = budgets.filter(user=user)
+        return budgets
 
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return BudgetReadSerializer
         return BudgetSerializer
 
+    @conditional_on_data("budgets", admin_sees_all=True)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        responses={200: BudgetAlertSerializer(many=True)},
+        description="Active budgets that crossed an alert threshold (80%/100% of the limit)",
+    )
+    @action(detail=False, methods=["get"])
+    def alerts(self, request):
+        budgets = budget_alerts(self.get_queryset())
+        return Response(BudgetAlertSerializer(budgets, many=True).data)
+
     def perform_create(self, serializer):
         serializer.save()